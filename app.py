@@ -1,19 +1,17 @@
 # app.py — Chessscore
 import streamlit as st
-from db.repo import init_db, load_games
+from core import perf
+from core.ratings import DEFAULT_PARAMS
+from db.repo import init_db
 
-from core.elo import compute_ratings
-from ui.components import render_sidebar_leaderboard
-from ui.pages import render_tab_saisie_histo, render_tab_classement, render_tab_export, render_tab_params, render_tab_admin
+from ui.pages import render_league_selector, render_sidebar_fragment, render_tab_saisie_histo, render_tab_classement, render_tab_export, render_tab_params, render_tab_admin
 
 
-# Constantes par défaut
-DEFAULT_START_RATING = 1200
-DEFAULT_K = 20
-NEWBIE_GAMES = 10
-NEWBIE_K = 40
-
 st.set_page_config(page_title="Chessscore – ELO", page_icon="♟️", layout="wide")
+
+# Instrumentation : un rerun interrompu (st.rerun / st.stop) est clos au rerun suivant
+perf.finish_rerun(st.session_state.pop("_perf_rerun", None))
+st.session_state._perf_rerun = perf.begin_rerun("app")
 st.title("♟️ Chessscore – Team ELO")
 
 # DB init (idempotent)
@@ -26,12 +24,7 @@ except Exception as e:
 
 # Session params
 if "elo_params" not in st.session_state:
-    st.session_state.elo_params = {
-        "start_rating": DEFAULT_START_RATING,
-        "base_k": DEFAULT_K,
-        "newbie_games": NEWBIE_GAMES,
-        "newbie_k": NEWBIE_K,
-    }
+    st.session_state.elo_params = dict(DEFAULT_PARAMS)
 params = st.session_state.elo_params
 
 # --- Cache & versioning des données ---
@@ -41,40 +34,26 @@ if "data_version" not in st.session_state:
 def bump_data_version():
     st.session_state.data_version += 1
 
-def compute_cached_for_ui():
-    games_df = load_games(st.session_state.data_version)
-    ratings, games_enriched = compute_ratings(games_df, st.session_state.elo_params["start_rating"],
-                                                        st.session_state.elo_params["base_k"],
-                                                        st.session_state.elo_params["newbie_games"],
-                                                        st.session_state.elo_params["newbie_k"],)
-    return games_df, ratings, games_enriched
-
-# --- Sidebar leaderboard (utilise le cache) ---
-games_df, ratings_sidebar, _ = compute_cached_for_ui()
+# un rerun complet relit l'historique (écritures des autres sessions)
+st.session_state.pop("_sidebar_ratings", None)
 with st.sidebar:
-    render_sidebar_leaderboard(ratings_sidebar)
-
-
-# # Tabs
-# tab_saisie_hist, tab_classement, tab_export, tab_params, tab_admin = st.tabs([
-#     "Saisir / Historique",
-#     "Classement",
-#     "Export",
-#     "Paramètres",
-#     "Admin",
-# ])
-
-# with tab_saisie_hist:
-#     render_tab_saisie_histo(params)
-
-# with tab_classement:
-#     render_tab_classement(params)
-
-# with tab_export:
-#     render_tab_export(params)
-
-# with tab_params:
-#     render_tab_params(params)
+    # ligue courante : limite toutes les pages et le classement de la sidebar
+    render_league_selector()
+
+
+# Pages : seule la page active est exécutée (pas de calcul pour les autres onglets)
+page = st.navigation([
+    st.Page(lambda: render_tab_saisie_histo(params), title="Saisir / Historique", icon="✏️", url_path="saisie", default=True),
+    st.Page(lambda: render_tab_classement(params), title="Classement", icon="🏆", url_path="classement"),
+    st.Page(lambda: render_tab_export(params), title="Export", icon="📤", url_path="export"),
+    st.Page(lambda: render_tab_params(params), title="Paramètres", icon="⚙️", url_path="parametres"),
+    st.Page(render_tab_admin, title="Admin", icon="🛠️", url_path="admin"),
+])
+with perf.span(f"page.{page.title}"):
+    page.run()
+
+# --- Sidebar leaderboard, rendu après la page : reflète les écritures de ce rerun (import, admin) ---
+with st.sidebar:
+    render_sidebar_fragment()
 
-# with tab_admin:
-#     render_tab_admin()
+perf.finish_rerun(st.session_state.pop("_perf_rerun", None))
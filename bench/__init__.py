@@ -0,0 +1,2 @@
+# Benchmarks Chessscore : générateur de ligues synthétiques + mesures des chemins critiques.
+# Usage : python -m bench --sizes 1000,10000,100000 --out bench-results.json
@@ -0,0 +1,24 @@
+import os
+import tempfile
+
+from sqlalchemy import create_engine, text
+
+from db import backends
+
+def sqlite_engine(directory: str | None = None):
+    """SQLite embarqué (db.backends), même schéma que l'application, dans un répertoire jetable."""
+    directory = directory or tempfile.mkdtemp(prefix="chessscore-bench-")
+    eng = backends.sqlite_engine(os.path.join(directory, "chessscore.db"))
+    backends.apply_schema(eng)
+    return eng
+
+def postgres_engine(url: str):
+    """Postgres existant : applique db/schema.sql (idempotent)."""
+    eng = create_engine(url)
+    backends.apply_schema(eng)
+    return eng
+
+def reset_games(eng) -> None:
+    with eng.begin() as con:
+        con.execute(text("delete from chessscore.games"))
+        con.execute(text("delete from chessscore.games_tombstones"))
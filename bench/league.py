@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+def generate_league(
+    n_games: int,
+    n_players: int = 300,
+    draw_rate: float = 0.1,
+    days: int = 365,
+    start: str = "2024-01-01",
+    seed: int = 0,
+) -> pd.DataFrame:
+    """Ligue synthétique déterministe : colonnes id, date, white, black, result.
+
+    Chaque joueur a une force cachée ; les résultats suivent l'espérance ELO
+    correspondante, avec `draw_rate` de nulles. Les parties sont réparties sur
+    `days` jours et chaque triplet (date, white, black) est unique, comme
+    l'impose l'index games_uniq_league (par ligue).
+    """
+    if n_players < 2:
+        raise ValueError("n_players must be >= 2")
+    pairs = n_players * (n_players - 1)
+    per_day = -(-n_games // days)
+    if per_day > pairs:
+        raise ValueError(f"{n_games} games over {days} days exceed the {pairs} distinct pairings per day; raise days or n_players")
+
+    rng = np.random.default_rng(seed)
+    strength = rng.normal(1500, 200, n_players)
+
+    # appariements ordonnés distincts, tirés sans remise jour par jour
+    day_sizes = np.full(days, n_games // days)
+    day_sizes[: n_games % days] += 1
+    pair_idx = np.concatenate([rng.choice(pairs, size=k, replace=False) for k in day_sizes if k])
+    white = pair_idx // (n_players - 1)
+    black = pair_idx % (n_players - 1)
+    black = black + (black >= white)
+    day = np.repeat(np.arange(days), day_sizes)
+
+    exp_white = 1.0 / (1.0 + 10 ** ((strength[black] - strength[white]) / 400.0))
+    u = rng.random(n_games)
+    p_win = exp_white * (1.0 - draw_rate)
+    result = np.where(u < p_win, 1.0, np.where(u < p_win + draw_rate, 0.5, 0.0))
+
+    names = np.array([f"Player{i:04d}" for i in range(n_players)], dtype=object)
+    dates = (pd.Timestamp(start) + pd.to_timedelta(day, unit="D")).date
+    return pd.DataFrame({
+        "id": np.arange(1, n_games + 1),
+        "date": dates,
+        "white": names[white],
+        "black": names[black],
+        "result": result,
+    })
@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from bench.db import postgres_engine, reset_games, sqlite_engine
+from bench.league import generate_league
+
+BENCHES = ["compute_ratings", "glicko2", "save_games_df", "load_games", "render_sidebar_leaderboard", "xlsx_export"]
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except Exception:
+        return None
+
+def _time(fn, repeat: int, setup=None) -> list[float]:
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+def run(sizes: list[int], benches: list[str], repeat: int, n_players: int, draw_rate: float, days: int,
+        seed: int, db_url: str | None, max_xlsx: int) -> dict:
+    import db.repo as repo
+    from core.cache import RATINGS
+    from core.elo import compute_ratings
+    from core.ratings import replay
+    from core.export import write_xlsx
+    from ui.components import _HTML, render_sidebar_leaderboard
+    import streamlit.logger
+    from streamlit import config
+    # rendu hors `streamlit run` : chaque appel st.* avertit de l'absence de ScriptRunContext ;
+    # la config (qui fixe le niveau de log) doit être lue avant d'abaisser le niveau
+    config.get_option("logger.level")
+    streamlit.logger.set_log_level("error")
+
+    eng = postgres_engine(db_url) if db_url else sqlite_engine()
+    repo.use_engine(eng)
+    results = []
+
+    def record(name, n_games, runs, **extra):
+        results.append({
+            "bench": name, "n_games": n_games, "n_players": n_players,
+            "seconds_min": min(runs), "seconds_median": statistics.median(runs), "runs": runs,
+            "games_per_s": n_games / min(runs) if min(runs) else None, **extra,
+        })
+        print(f"{name:<28} {n_games:>9,} games  min {min(runs):9.4f}s  median {statistics.median(runs):9.4f}s", flush=True)
+
+    for n in sizes:
+        games = generate_league(n, n_players=n_players, draw_rate=draw_rate, days=max(days, -(-n // (n_players * (n_players - 1)))), seed=seed)
+        reps = repeat if n < 100_000 else 1
+
+        if "compute_ratings" in benches:
+            runs = _time(lambda: compute_ratings(games, 1200, 20, 10, 40), reps, setup=RATINGS.clear)
+            record("compute_ratings", n, runs)
+
+        if "glicko2" in benches:
+            glicko = {"system": "glicko2", "start_rating": 1200, "rd": 350, "volatility": 0.06, "tau": 0.5, "period": "W"}
+            runs = _time(lambda: replay(games, glicko), reps)
+            record("glicko2", n, runs)
+
+        if "save_games_df" in benches or "load_games" in benches:
+            runs = _time(lambda: repo.save_games_df(games), reps if "save_games_df" in benches else 1,
+                         setup=lambda: reset_games(eng))
+            if "save_games_df" in benches:
+                record("save_games_df", n, runs, backend=eng.dialect.name)
+
+        if "load_games" in benches:
+            store = repo.GamesStore()
+            runs = _time(lambda: store.frame(0), reps, setup=store.invalidate)
+            record("load_games", n, runs, backend=eng.dialect.name, rows=len(store.frame(0)))
+
+        ratings, enriched = compute_ratings(games, 1200, 20, 10, 40)
+
+        if "render_sidebar_leaderboard" in benches:
+            # HTML mémoïsé : vidé avant chaque mesure, sinon seules les répétitions en cache comptent
+            runs = _time(lambda: render_sidebar_leaderboard(ratings), reps, setup=_HTML.clear)
+            record("render_sidebar_leaderboard", n, runs, players=len(ratings))
+
+        if "xlsx_export" in benches and n <= max_xlsx:
+            path = os.path.join(tempfile.mkdtemp(prefix="chessscore-bench-"), "export.xlsx")
+            runs = _time(lambda: write_xlsx(path, ratings, enriched), reps)
+            record("xlsx_export", n, runs, bytes=os.path.getsize(path))
+
+        RATINGS.clear()
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_rev": _git_rev(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "backend": eng.dialect.name,
+            "params": {"n_players": n_players, "draw_rate": draw_rate, "days": days, "seed": seed, "repeat": repeat},
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float | None) -> int:
+    """Affiche le ratio courant/référence par (bench, taille) ; code 1 si un ratio dépasse `threshold`."""
+    ref = {(r["bench"], r["n_games"]): r["seconds_min"] for r in baseline["results"]}
+    worst = 0.0
+    print(f"\n{'bench':<28} {'games':>9}  {'ref (s)':>9}  {'now (s)':>9}  ratio")
+    for r in current["results"]:
+        base = ref.get((r["bench"], r["n_games"]))
+        if not base:
+            continue
+        ratio = r["seconds_min"] / base
+        worst = max(worst, ratio)
+        flag = "  <-- regression" if threshold and ratio > threshold else ""
+        print(f"{r['bench']:<28} {r['n_games']:>9,}  {base:9.4f}  {r['seconds_min']:9.4f}  {ratio:5.2f}x{flag}")
+    return 1 if threshold and worst > threshold else 0
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m bench", description="Benchmarks Chessscore sur ligues synthétiques")
+    ap.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="nombres de parties, séparés par des virgules")
+    ap.add_argument("--bench", default=",".join(BENCHES), help=f"sous-ensemble de : {', '.join(BENCHES)}")
+    ap.add_argument("--repeat", type=int, default=3, help="répétitions par mesure (1 au-delà de 100k parties)")
+    ap.add_argument("--players", type=int, default=300)
+    ap.add_argument("--draw-rate", type=float, default=0.1)
+    ap.add_argument("--days", type=int, default=365)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--db-url", default=os.environ.get("CHESSSCORE_BENCH_DB_URL"),
+                    help="URL SQLAlchemy Postgres ; par défaut une base SQLite locale")
+    ap.add_argument("--max-xlsx", type=int, default=100_000, help="taille max pour l'export XLSX (openpyxl est lent)")
+    ap.add_argument("--out", default="bench-results.json")
+    ap.add_argument("--compare", help="fichier de résultats de référence")
+    ap.add_argument("--threshold", type=float, help="ratio max toléré avec --compare (ex. 1.25)")
+    args = ap.parse_args(argv)
+
+    benches = [b.strip() for b in args.bench.split(",") if b.strip()]
+    unknown = set(benches) - set(BENCHES)
+    if unknown:
+        ap.error(f"unknown bench: {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    report = run(sizes, benches, args.repeat, args.players, args.draw_rate, args.days, args.seed,
+                 args.db_url, args.max_xlsx)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nRésultats écrits dans {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            return compare(report, json.load(f), args.threshold)
+    return 0
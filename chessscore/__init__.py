@@ -0,0 +1,2 @@
+# CLI Chessscore sans Streamlit (cron, traitements par lots) : recalcul, export, import.
+# Usage : python -m chessscore --help
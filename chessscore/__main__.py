@@ -0,0 +1,5 @@
+import sys
+
+from chessscore.cli import main
+
+sys.exit(main())
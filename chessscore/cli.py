@@ -0,0 +1,139 @@
+import argparse
+import os
+import sys
+import tomllib
+
+import pandas as pd
+
+from core.elo import IncrementalRatings, params_key
+from core.export import FORMATS, SHEETS, write_csv, write_export
+from core.glicko import PERIODS
+from core.importer import ImportReport, read_batches, validated
+from core.leagues import DEFAULT_LEAGUE, league_summary
+from core.ratings import DEFAULT_PARAMS, SYSTEMS, rate, system_key, system_of
+from db import repo
+
+# Aucun import de streamlit sur ce chemin : db.repo reçoit la configuration lue ici.
+
+CONFIG_ENV = "CHESSSCORE_CONFIG"
+# même format que les secrets Streamlit (DB_URL, DB_POOL_*), plus une table [ratings] facultative
+CONFIG_FILES = [".streamlit/secrets.toml", "~/.streamlit/secrets.toml"]
+PARAM_TYPES = {
+    "start_rating": int, "base_k": int, "newbie_games": int, "newbie_k": int,
+    "rd": int, "volatility": float, "tau": float, "period": str,
+}
+
+def load_config(path: str | None = None) -> dict:
+    """Fichier TOML (`path`, $CHESSSCORE_CONFIG ou secrets Streamlit du projet) ; les variables DB_* de l'environnement priment."""
+    path = path or os.environ.get(CONFIG_ENV)
+    conf = {}
+    for candidate in [path] if path else [os.path.expanduser(p) for p in CONFIG_FILES]:
+        if path or os.path.exists(candidate):
+            with open(candidate, "rb") as f:
+                conf = tomllib.load(f)
+            break
+    conf.update({k: v for k, v in os.environ.items() if k.startswith("DB_")})
+    return conf
+
+def rating_params(conf: dict, args: argparse.Namespace) -> dict:
+    """Valeurs par défaut < table [ratings] de la configuration < options de la ligne de commande."""
+    params = {**DEFAULT_PARAMS, **conf.get("ratings", {})}
+    for k in ["system", *PARAM_TYPES]:
+        if getattr(args, k, None) is not None:
+            params[k] = getattr(args, k)
+    system_key(params)   # ValueError si le système est inconnu
+    return params
+
+def _leaderboard(games: pd.DataFrame, params: dict, league: str, rebuild: bool) -> pd.DataFrame:
+    """Élo : moteur incrémental sur les checkpoints persistants (réchauffés pour l'app) ; autres systèmes : rejeu."""
+    if system_of(params) != "elo":
+        return rate(games, params)[0]
+    values = system_key(params)[1:]
+    if rebuild:
+        repo.discard_checkpoints_after(params_key(values), -1, league)
+    return IncrementalRatings(repo.checkpoint_store(league)).leaderboard(games, *values)
+
+def cmd_recompute(args: argparse.Namespace, params: dict) -> int:
+    leagues = [args.league] if args.league else sorted(repo.load_league_games(0))
+    frames = {lg: repo.load_games(0, lg) for lg in leagues}
+    tables = {lg: _leaderboard(games, params, lg, args.rebuild) for lg, games in frames.items()}
+    print(league_summary(frames, tables).to_string(index=False))
+    return 0
+
+def cmd_export(args: argparse.Namespace, params: dict) -> int:
+    ratings, games_enriched = rate(repo.load_games(0, args.league), params)
+    ext = FORMATS[args.format][1]
+    out = args.output or (f"chessscore_export.{ext}" if args.format == "xlsx" else f"chessscore_{args.sheet}.{ext}")
+    write_export(out, args.format, args.sheet, ratings, games_enriched)
+    print(f"Export écrit dans {out}", file=sys.stderr)
+    return 0
+
+def cmd_import(args: argparse.Namespace, params: dict) -> int:
+    players = repo.load_players(0, args.league)
+    aliases = {} if players.empty else dict(players.dropna(subset=["alias"]).set_index("alias")["name"])
+    fmt = args.format or ("pgn" if args.file.lower().endswith(".pgn") else "csv")
+    report = ImportReport()
+    try:
+        with open(args.file, encoding="utf-8-sig", errors="replace") as f:
+            report.written = repo.import_games(validated(read_batches(f, fmt), report, aliases), args.league)
+    except ValueError as e:
+        print(f"Import impossible : {e}", file=sys.stderr)
+        return 1
+    print(f"{report.written} partie(s) importée(s) sur {report.read} ligne(s) lue(s).")
+    rejected = report.rejected
+    if len(rejected):
+        print(f"{len(rejected)} ligne(s) rejetée(s)", file=sys.stderr)
+        if args.rejected:
+            write_csv(args.rejected, rejected)
+        else:
+            print(rejected.to_string(index=False), file=sys.stderr)
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m chessscore", description="Chessscore sans interface : recalcul, export, import")
+    ap.add_argument("--config", help=f"fichier TOML (défaut : ${CONFIG_ENV}, sinon .streamlit/secrets.toml)")
+    ap.add_argument("--db-url", help="URL SQLAlchemy, prioritaire sur la configuration")
+
+    ratings = argparse.ArgumentParser(add_help=False)
+    g = ratings.add_argument_group("classement (défaut : table [ratings] de la configuration)")
+    g.add_argument("--system", choices=list(SYSTEMS))
+    for k, t in PARAM_TYPES.items():
+        g.add_argument("--" + k.replace("_", "-"), dest=k, type=t, choices=list(PERIODS) if k == "period" else None)
+
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("recompute", parents=[ratings], help="recalcule les classements et affiche un résumé par ligue")
+    p.add_argument("--league", help="une seule ligue (défaut : toutes)")
+    p.add_argument("--rebuild", action="store_true", help="Élo : supprime les checkpoints avant de rejouer")
+    p.set_defaults(func=cmd_recompute)
+
+    p = sub.add_parser("export", parents=[ratings], help="classement ou historique enrichi d'une ligue")
+    p.add_argument("sheet", nargs="?", choices=list(SHEETS), default="classement")
+    p.add_argument("--league", default=DEFAULT_LEAGUE)
+    p.add_argument("--format", choices=list(FORMATS), default="csv")
+    p.add_argument("-o", "--output", help="fichier de sortie (défaut : chessscore_<sheet>.<format>)")
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("import", help="import en masse d'un fichier CSV ou PGN")
+    p.add_argument("file")
+    p.add_argument("--league", default=DEFAULT_LEAGUE)
+    p.add_argument("--format", choices=["csv", "pgn"], help="défaut : selon l'extension")
+    p.add_argument("--rejected", help="CSV des lignes rejetées (défaut : sur stderr)")
+    p.set_defaults(func=cmd_import)
+    return ap
+
+def main(argv: list[str] | None = None) -> int:
+    ap = build_parser()
+    args = ap.parse_args(argv)
+    try:
+        conf = load_config(args.config)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        ap.error(f"configuration: {e}")
+    if args.db_url:
+        conf["DB_URL"] = args.db_url
+    try:
+        params = rating_params(conf, args)
+        repo.use_engine(repo.get_engine(conf))
+    except (ValueError, RuntimeError) as e:
+        ap.error(str(e))
+    repo.init_db()
+    return args.func(args, params)
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from core import perf
+
+class LRUCache:
+    """Cache LRU borné, partagé par toutes les sessions du process (thread-safe)."""
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+def dataset_fingerprint(games: pd.DataFrame) -> tuple:
+    """Empreinte bon marché d'un historique : (révision du store, nb de lignes, id max).
+
+    Les frames servies par db.repo.GamesStore portent leur révision dans
+    `attrs["revision"]` ; à défaut on ajoute un hash vectorisé du contenu.
+    """
+    with perf.span("cache.fingerprint", rows=len(games)):
+        max_id = int(games["id"].max()) if "id" in games.columns and games["id"].notna().any() else None
+        revision = games.attrs.get("revision")
+        if revision is None:
+            revision = ("hash", int(pd.util.hash_pandas_object(games, index=False).sum()))
+        return revision, len(games), max_id
+
+# Résultats de classement (clé = empreinte + paramètres ELO)
+RATINGS = LRUCache(maxsize=8)
@@ -1,6 +1,15 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
 import numpy as np
 import pandas as pd
-import streamlit as st
+
+from core import perf
+from core.cache import RATINGS, dataset_fingerprint
+from core.history import RatingHistory
+from core.results import parse_results
 
 def expected_score(ra: float, rb: float) -> float:
     return 1.0 / (1.0 + 10 ** ((rb - ra) / 400.0))
@@ -10,45 +19,150 @@ def update_elo(ra: float, rb: float, sa: float, k: float) -> tuple[float, float]
     eb = 1.0 - ea
     return ra + k * (sa - ea), rb + k * ((1.0 - sa) - eb)
 
-@st.cache_data(show_spinner=False)
-def compute_ratings(
-    games: pd.DataFrame,
-    start_rating: int,
+ENRICH_COLS = [
+    "white_rating_pre","black_rating_pre","white_rating_post","black_rating_post",
+    "k_white","k_black","exp_white","exp_black",
+]
+
+def _intern_players(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """Noms -> ids entiers, dans l'ordre de première apparition (blancs puis noirs, partie par partie)."""
+    names = np.column_stack([
+        df["white"].astype(str).str.strip().to_numpy(dtype=object),
+        df["black"].astype(str).str.strip().to_numpy(dtype=object),
+    ]).ravel()
+    codes, uniques = pd.factorize(names)
+    codes = codes.reshape(-1, 2)
+    return codes[:, 0], codes[:, 1], list(uniques)
+
+def _empty_result(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return (
+        pd.DataFrame(columns=["player","rating","games","wins","draws","losses"]),
+        df.assign(**{c: np.nan for c in ENRICH_COLS}),
+    )
+
+def _prepare(games: pd.DataFrame) -> pd.DataFrame:
+    df = games.copy()
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    # tri stable ; à date égale, l'id (ordre d'insertion) départage
+    order = ["date", "id"] if "id" in df.columns else "date"
+    return df.sort_values(order, kind="stable").reset_index(drop=True)
+
+def _tally(w_ids: np.ndarray, b_ids: np.ndarray, s_white: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Victoires / défaites par id joueur, en une passe (bincount)."""
+    white_won, black_won = (s_white == 1.0), (s_white == 0.0)
+    wins = np.bincount(w_ids, weights=white_won, minlength=n) + np.bincount(b_ids, weights=black_won, minlength=n)
+    losses = np.bincount(w_ids, weights=black_won, minlength=n) + np.bincount(b_ids, weights=white_won, minlength=n)
+    return wins.astype(np.int64), losses.astype(np.int64)
+
+def _rating_table(
+    names: list[str],
+    ratings: np.ndarray,
+    counts: np.ndarray,
+    wins: np.ndarray,
+    losses: np.ndarray,
+) -> pd.DataFrame:
+    table = pd.DataFrame({
+        "player": names,
+        "rating": [round(r, 1) for r in ratings.tolist()],
+        "games": counts,
+        "wins": wins,
+        "draws": counts - wins - losses,
+        "losses": losses,
+    })
+    return table.sort_values(["rating","games"], ascending=[False, True]).reset_index(drop=True)
+
+def _grow(arr: np.ndarray | None, size: int, fill, dtype) -> np.ndarray:
+    out = np.full(size, fill, dtype=dtype)
+    if arr is not None:
+        out[:len(arr)] = arr
+    return out
+
+def replay_arrays(
+    w_ids: np.ndarray,
+    b_ids: np.ndarray,
+    s_white: np.ndarray,
+    n_players: int,
+    start_rating: float,
     base_k: int,
     newbie_games: int,
     newbie_k: int,
-) -> tuple[pd.DataFrame, pd.DataFrame]:
-    df = games.copy()
-    if df.empty:
-        return (
-            pd.DataFrame(columns=["player","rating","games","wins","draws","losses"]),
-            df.assign(
-                white_rating_pre=np.nan, black_rating_pre=np.nan,
-                white_rating_post=np.nan, black_rating_post=np.nan,
-                k_white=np.nan, k_black=np.nan, exp_white=np.nan, exp_black=np.nan
-            ),
-        )
+    ratings: np.ndarray | None = None,
+    counts: np.ndarray | None = None,
+    snapshot_at: Sequence[int] = (),
+    on_snapshot: Callable[[int, np.ndarray, np.ndarray], None] | None = None,
+) -> tuple[np.ndarray, np.ndarray, dict[str, np.ndarray]]:
+    """Rejoue les parties sur des tableaux indexés par id joueur.
 
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    df = df.sort_values("date").reset_index(drop=True)
+    Renvoie (ratings, counts, enrich) où enrich contient les colonnes ENRICH_COLS
+    sous forme de tableaux typés, une valeur par partie. Si `ratings`/`counts`
+    sont fournis, le rejeu repart de cet état (copié, complété pour les nouveaux ids).
+    `on_snapshot(j, ratings, counts)` est appelé après la j-ième partie pour
+    chaque j de `snapshot_at` (positions croissantes).
+    """
+    n = len(w_ids)
+    ratings = _grow(ratings, n_players, start_rating, np.float64)
+    counts = _grow(counts, n_players, 0, np.int64)
+    k_dtype = np.result_type(np.asarray(base_k), np.asarray(newbie_k))
+
+    w_pre, b_pre = np.empty(n), np.empty(n)
+    w_post, b_post = np.empty(n), np.empty(n)
+    k_w_arr, k_b_arr = np.empty(n, dtype=k_dtype), np.empty(n, dtype=k_dtype)
+    e_w_arr, e_b_arr = np.empty(n), np.empty(n)
+    snaps = iter(snapshot_at if on_snapshot else ())
+    next_snap = next(snaps, -1)
+
+    for i, (w, b, s) in enumerate(zip(w_ids.tolist(), b_ids.tolist(), s_white.tolist())):
+        rw, rb = float(ratings[w]), float(ratings[b])
+        k_w = newbie_k if counts[w] < newbie_games else base_k
+        k_b = newbie_k if counts[b] < newbie_games else base_k
+
+        ew = expected_score(rw, rb)
+        eb = 1.0 - ew
+        rw_new = rw + k_w * (s - ew)
+        rb_new = rb + k_b * ((1.0 - s) - eb)
 
+        ratings[w], ratings[b] = rw_new, rb_new
+        counts[w] += 1
+        counts[b] += 1
+
+        w_pre[i], b_pre[i], w_post[i], b_post[i] = rw, rb, rw_new, rb_new
+        k_w_arr[i], k_b_arr[i], e_w_arr[i], e_b_arr[i] = k_w, k_b, ew, eb
+
+        if i + 1 == next_snap:
+            on_snapshot(i + 1, ratings.copy(), counts.copy())
+            next_snap = next(snaps, -1)
+
+    enrich = dict(zip(ENRICH_COLS, [w_pre, b_pre, w_post, b_post, k_w_arr, k_b_arr, e_w_arr, e_b_arr]))
+    return ratings, counts, enrich
+
+def _leaderboard(
+    names: list[str],
+    ratings: np.ndarray,
+    counts: np.ndarray,
+    w_ids: np.ndarray,
+    b_ids: np.ndarray,
+    s_white: np.ndarray,
+) -> pd.DataFrame:
+    """Classement + bilans V/N/D agrégés en une passe (bincount sur les ids joueurs)."""
+    wins, losses = _tally(w_ids, b_ids, s_white, len(names))
+    return _rating_table(names, ratings, counts, wins, losses)
+
+def _compute_ratings_arrays(df, start_rating, base_k, newbie_games, newbie_k):
+    w_ids, b_ids, names = _intern_players(df)
+    s_white = parse_results(df["result"])
+    ratings, counts, enrich = replay_arrays(
+        w_ids, b_ids, s_white, len(names), start_rating, base_k, newbie_games, newbie_k
+    )
+    return _leaderboard(names, ratings, counts, w_ids, b_ids, s_white), df.assign(**enrich)
+
+def _compute_ratings_loop(df, start_rating, base_k, newbie_games, newbie_k):
     ratings, counts = {}, {}
-    enrich = {k: [] for k in [
-        "white_rating_pre","black_rating_pre","white_rating_post","black_rating_post",
-        "k_white","k_black","exp_white","exp_black"
-    ]}
+    enrich = {k: [] for k in ENRICH_COLS}
+    scores = parse_results(df["result"])
 
-    for _, row in df.iterrows():
+    for i, (_, row) in enumerate(df.iterrows()):
         w, b = str(row["white"]).strip(), str(row["black"]).strip()
-        # normalise result
-        try:
-            s_white = float(row["result"])
-        except Exception:
-            v = str(row["result"]).replace(" ", "").lower()
-            if v in ("1-0","w","white"): s_white = 1.0
-            elif v in ("0-1","b","black"): s_white = 0.0
-            elif v in ("0.5-0.5","1/2-1/2","d","draw"): s_white = 0.5
-            else: raise ValueError(f"Invalid result: {row['result']}")
+        s_white = float(scores[i])
 
         rw, rb = ratings.get(w, start_rating), ratings.get(b, start_rating)
         cw, cb = counts.get(w, 0), counts.get(b, 0)
@@ -74,17 +188,426 @@ def compute_ratings(
         enrich["exp_white"].append(ew)
         enrich["exp_black"].append(rb_exp)
 
-    rows = []
-    for p, r in ratings.items():
-        n = counts.get(p, 0)
-        m_w, m_b = df[df.white.astype(str)==p], df[df.black.astype(str)==p]
-        w_w = m_w["result"].astype(str).isin(["1","1.0","1-0","w","white"]).sum()
-        l_w = m_w["result"].astype(str).isin(["0","0.0","0-1","b","black"]).sum()
-        d_w = len(m_w) - w_w - l_w
-        w_b = m_b["result"].astype(str).isin(["0","0.0","0-1","b","black"]).sum()
-        l_b = m_b["result"].astype(str).isin(["1","1.0","1-0","w","white"]).sum()
-        d_b = len(m_b) - w_b - l_b
-        rows.append(dict(player=p, rating=round(r,1), games=n, wins=w_w+w_b, draws=d_w+d_b, losses=l_w+l_b))
-
-    rating_table = pd.DataFrame(rows).sort_values(["rating","games"], ascending=[False, True]).reset_index(drop=True)
-    return rating_table, df.assign(**enrich)
+    w_ids, b_ids, names = _intern_players(df)
+    table = _leaderboard(
+        names,
+        np.array([ratings[p] for p in names], dtype=np.float64),
+        np.array([counts[p] for p in names], dtype=np.int64),
+        w_ids, b_ids, scores,
+    )
+    return table, df.assign(**enrich)
+
+ENGINES = {
+    "array": _compute_ratings_arrays,  # ids entiers + tableaux NumPy préalloués
+    "loop": _compute_ratings_loop,     # implémentation de référence (iterrows + dicts)
+}
+
+def compute_ratings(
+    games: pd.DataFrame,
+    start_rating: int,
+    base_k: int,
+    newbie_games: int,
+    newbie_k: int,
+    engine: str = "array",
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Rejeu complet, mis en cache (LRU partagé) par empreinte de l'historique + paramètres.
+
+    Les frames renvoyées sont partagées : ne pas les modifier en place.
+    """
+    if games.empty:
+        return _empty_result(games.copy())
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    key = ("compute_ratings", dataset_fingerprint(games), start_rating, base_k, newbie_games, newbie_k, engine)
+
+    def replay():
+        with perf.span("elo.replay", rows=len(games)):
+            return ENGINES[engine](_prepare(games), start_rating, base_k, newbie_games, newbie_k)
+    return RATINGS.get_or_compute(key, replay)
+
+
+def leaderboard_as_of(history: RatingHistory, date) -> pd.DataFrame:
+    """Classement à la fin du jour `date`, lu dans les séries par recherche binaire (sans rejeu)."""
+    ids, ratings, counts, wins, losses = history.state_at(history.games_until(date))
+    return _rating_table([history.names[i] for i in ids], ratings, counts, wins, losses)
+
+
+# --------------------
+# Moteur incrémental
+# --------------------
+
+GAME_KEY_COLS = ["date", "white", "black", "result"]
+CHECKPOINT_EVERY = 500   # une photo de l'état toutes les N parties
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """Empreinte par partie (colonnes utiles au calcul + id si présent)."""
+    cols = [c for c in ["id"] + GAME_KEY_COLS if c in df.columns]
+    return pd.util.hash_pandas_object(df[cols].astype(str), index=False).to_numpy()
+
+def _chain(hashes: np.ndarray, prev: list[str] = ()) -> list[str]:
+    """Empreintes chaînées du préfixe, une par bloc complet de CHECKPOINT_EVERY parties.
+
+    chain[m] identifie les (m+1)*CHECKPOINT_EVERY premières parties ; `prev` permet
+    de prolonger une chaîne déjà calculée sur un préfixe de `hashes`.
+    """
+    out = list(prev)
+    for start in range(len(out) * CHECKPOINT_EVERY, len(hashes) - CHECKPOINT_EVERY + 1, CHECKPOINT_EVERY):
+        h = hashlib.blake2b(digest_size=16)
+        h.update(out[-1].encode() if out else b"")
+        h.update(hashes[start:start + CHECKPOINT_EVERY].tobytes())
+        out.append(h.hexdigest())
+    return out
+
+def params_key(params: tuple) -> str:
+    return "|".join(str(p) for p in params)
+
+@dataclass
+class Checkpoint:
+    """Photo de l'état après `n_games` parties (joueurs dans l'ordre d'apparition)."""
+    n_games: int
+    last_date: pd.Timestamp
+    digest: str
+    names: list[str]
+    ratings: np.ndarray
+    counts: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+
+    def to_record(self) -> dict:
+        return {
+            "n_games": self.n_games,
+            "last_date": self.last_date.date(),
+            "digest": self.digest,
+            "state": json.dumps({
+                "names": self.names,
+                "ratings": self.ratings.tolist(),
+                "counts": self.counts.tolist(),
+                "wins": self.wins.tolist(),
+                "losses": self.losses.tolist(),
+            }),
+        }
+
+    @classmethod
+    def from_record(cls, rec: dict) -> "Checkpoint":
+        state = rec["state"] if isinstance(rec["state"], dict) else json.loads(rec["state"])
+        return cls(
+            n_games=int(rec["n_games"]),
+            last_date=pd.Timestamp(rec["last_date"]),
+            digest=rec["digest"],
+            names=list(state["names"]),
+            ratings=np.asarray(state["ratings"], dtype=np.float64),
+            counts=np.asarray(state["counts"], dtype=np.int64),
+            wins=np.asarray(state["wins"], dtype=np.int64),
+            losses=np.asarray(state["losses"], dtype=np.int64),
+        )
+
+@dataclass
+class CheckpointStore:
+    """Accès au stockage persistant des checkpoints (cf. db.repo), par clé de paramètres."""
+    index: Callable[[str], dict[int, str]]           # params_key -> {n_games: digest}
+    load: Callable[[str, int], dict | None]          # params_key, n_games -> record
+    save: Callable[[str, list[dict]], None]          # params_key, records
+    discard_after: Callable[[str, int], None]        # params_key, n_games
+
+@dataclass
+class RatingState:
+    """État du classement après la dernière partie rejouée."""
+    params: tuple
+    names: list[str]
+    index: dict[str, int]
+    ratings: np.ndarray
+    counts: np.ndarray
+    wins: np.ndarray
+    losses: np.ndarray
+    hashes: np.ndarray       # empreintes des parties déjà appliquées, dans l'ordre du rejeu
+    chain: list[str]         # empreintes chaînées par bloc de CHECKPOINT_EVERY parties
+    enriched: pd.DataFrame
+    last_date: pd.Timestamp | None
+    w_ids: np.ndarray        # ids joueurs par partie rejouée (séries Élo, cf. core.history)
+    b_ids: np.ndarray
+    enriched_offset: int = 0  # > 0 si l'état a repris d'un checkpoint sans le détail des parties antérieures
+
+    def table(self) -> pd.DataFrame:
+        return _rating_table(self.names, self.ratings, self.counts, self.wins, self.losses)
+
+def _empty_state(params: tuple, enriched: pd.DataFrame) -> RatingState:
+    return RatingState(
+        params=params, names=[], index={},
+        ratings=np.empty(0), counts=np.empty(0, dtype=np.int64),
+        wins=np.empty(0, dtype=np.int64), losses=np.empty(0, dtype=np.int64),
+        hashes=np.empty(0, dtype=np.uint64), chain=[], enriched=enriched, last_date=None,
+        w_ids=np.empty(0, dtype=np.int64), b_ids=np.empty(0, dtype=np.int64),
+    )
+
+def _state_from_checkpoint(
+    cp: Checkpoint, params: tuple, hashes: np.ndarray, chain: list[str], known: RatingState | None,
+) -> RatingState:
+    """Reprend à partir d'un checkpoint ; `known` = état dont les cp.n_games premières parties sont identiques."""
+    n = cp.n_games
+    enriched = known.enriched if known is not None else None
+    empty_ids = np.empty(0, dtype=np.int64)
+    return RatingState(
+        params=params, names=list(cp.names), index={p: i for i, p in enumerate(cp.names)},
+        ratings=cp.ratings.copy(), counts=cp.counts.copy(), wins=cp.wins.copy(), losses=cp.losses.copy(),
+        hashes=hashes[:n], chain=chain[:n // CHECKPOINT_EVERY],
+        enriched=enriched.iloc[:n] if enriched is not None else enriched_columns(pd.DataFrame()),
+        last_date=cp.last_date,
+        w_ids=known.w_ids[:n] if known is not None else empty_ids,
+        b_ids=known.b_ids[:n] if known is not None else empty_ids,
+        enriched_offset=0 if enriched is not None else n,
+    )
+
+def enriched_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(**{c: np.nan for c in ENRICH_COLS})
+
+def apply_games(
+    state: RatingState,
+    new_games: pd.DataFrame,
+    hashes: np.ndarray | None = None,
+    on_checkpoint: Callable[[Checkpoint], None] | None = None,
+) -> RatingState:
+    """Applique des parties postérieures à l'état (déjà triées, dates converties).
+
+    `on_checkpoint` reçoit un Checkpoint à chaque multiple de CHECKPOINT_EVERY parties franchi.
+    """
+    if new_games.empty:
+        return state
+    start_rating, base_k, newbie_games, newbie_k = state.params
+
+    # ids locaux au lot -> ids globaux ; les nouveaux joueurs sont ajoutés dans l'ordre d'apparition
+    names, index = list(state.names), dict(state.index)
+    w_local, b_local, batch_names = _intern_players(new_games)
+    for p in batch_names:
+        if p not in index:
+            index[p] = len(names)
+            names.append(p)
+    to_global = np.array([index[p] for p in batch_names], dtype=np.int64)
+    w_ids, b_ids = to_global[w_local], to_global[b_local]
+
+    s_white = parse_results(new_games["result"])
+    all_hashes = np.concatenate([state.hashes, _row_hashes(new_games) if hashes is None else hashes])
+    chain = _chain(all_hashes, state.chain)
+
+    n0 = len(state.hashes)
+    first = -n0 % CHECKPOINT_EVERY or CHECKPOINT_EVERY
+    snapshot_at = range(first, len(new_games) + 1, CHECKPOINT_EVERY)
+    prev_wins = _grow(state.wins, len(names), 0, np.int64)
+    prev_losses = _grow(state.losses, len(names), 0, np.int64)
+
+    def snapshot(j: int, ratings: np.ndarray, counts: np.ndarray) -> None:
+        # joueurs vus jusqu'ici = préfixe des ids (attribués dans l'ordre d'apparition)
+        n_seen = max(len(state.names), int(max(w_ids[:j].max(), b_ids[:j].max())) + 1)
+        wins, losses = _tally(w_ids[:j], b_ids[:j], s_white[:j], len(names))
+        on_checkpoint(Checkpoint(
+            n_games=n0 + j,
+            last_date=new_games["date"].iloc[j - 1],
+            digest=chain[(n0 + j) // CHECKPOINT_EVERY - 1],
+            names=names[:n_seen],
+            ratings=ratings[:n_seen],
+            counts=counts[:n_seen],
+            wins=(prev_wins + wins)[:n_seen],
+            losses=(prev_losses + losses)[:n_seen],
+        ))
+
+    ratings, counts, enrich = replay_arrays(
+        w_ids, b_ids, s_white, len(names), start_rating, base_k, newbie_games, newbie_k,
+        ratings=state.ratings, counts=state.counts,
+        snapshot_at=snapshot_at, on_snapshot=snapshot if on_checkpoint else None,
+    )
+    wins, losses = _tally(w_ids, b_ids, s_white, len(names))
+    new_enriched = new_games.assign(**enrich)
+    enriched = new_enriched if state.enriched.empty else pd.concat([state.enriched, new_enriched], ignore_index=True)
+
+    return RatingState(
+        params=state.params, names=names, index=index,
+        ratings=ratings, counts=counts,
+        wins=prev_wins + wins,
+        losses=prev_losses + losses,
+        hashes=all_hashes,
+        chain=chain,
+        enriched=enriched,
+        last_date=new_games["date"].iloc[-1],
+        w_ids=np.concatenate([state.w_ids, w_ids]),
+        b_ids=np.concatenate([state.b_ids, b_ids]),
+        enriched_offset=state.enriched_offset,
+    )
+
+def _first_mismatch(old: np.ndarray, new: np.ndarray) -> int:
+    n = min(len(old), len(new))
+    diff = np.flatnonzero(old[:n] != new[:n])
+    return int(diff[0]) if len(diff) else n
+
+class IncrementalRatings:
+    """Classement incrémental : garde le dernier état et n'applique que les parties ajoutées en fin d'historique.
+
+    Si l'historique déjà rejoué a changé (édition, suppression, partie insérée
+    dans le passé) ou si les paramètres changent, on reprend du checkpoint le
+    plus récent encore valide (en mémoire ou dans `store`), sinon du début.
+    """
+
+    def __init__(self, store: CheckpointStore | None = None):
+        self.store = store
+        self.state: RatingState | None = None
+        self.last_mode: str | None = None   # "full" | "resume" | "append" | "unchanged"
+        self.replayed = 0                     # parties rejouées au dernier appel
+        self._df: pd.DataFrame | None = None
+        self._history: tuple[RatingState, RatingHistory] | None = None
+        self._checkpoints: dict[str, dict[int, Checkpoint]] = {}   # params_key -> n_games -> checkpoint
+        self._stored: dict[str, dict[int, str]] = {}                # params_key -> n_games -> digest (store)
+
+    def compute(
+        self,
+        games: pd.DataFrame,
+        start_rating: int,
+        base_k: int,
+        newbie_games: int,
+        newbie_k: int,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Classement + détail par partie (complet)."""
+        if games.empty:
+            self.state, self.last_mode = None, "full"
+            return _empty_result(games.copy())
+        self._sync(games, (start_rating, base_k, newbie_games, newbie_k))
+        if self.state.enriched_offset:
+            # repris d'un checkpoint persistant : le détail des parties antérieures n'est pas connu
+            with perf.span("elo.replay", rows=len(self._df)):
+                self.state = apply_games(_empty_state(self.state.params, self._df.iloc[:0]), self._df, self.state.hashes)
+        return self.state.table(), self.state.enriched
+
+    def leaderboard(
+        self,
+        games: pd.DataFrame,
+        start_rating: int,
+        base_k: int,
+        newbie_games: int,
+        newbie_k: int,
+    ) -> pd.DataFrame:
+        """Classement seul : peut reprendre d'un checkpoint persistant sans reconstruire le détail."""
+        if games.empty:
+            self.state, self.last_mode = None, "full"
+            return _empty_result(games.copy())[0]
+        self._sync(games, (start_rating, base_k, newbie_games, newbie_k))
+        return self.state.table()
+
+    def history(
+        self,
+        games: pd.DataFrame,
+        start_rating: int,
+        base_k: int,
+        newbie_games: int,
+        newbie_k: int,
+    ) -> RatingHistory:
+        """Séries Élo par joueur, construites à partir des ids et classements post-partie du rejeu."""
+        self.compute(games, start_rating, base_k, newbie_games, newbie_k)
+        state = self.state
+        if state is None:
+            return RatingHistory.build([], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), [], [], [], [])
+        if self._history is None or self._history[0] is not state:
+            with perf.span("elo.history", rows=len(state.w_ids)):
+                self._history = (state, RatingHistory.build(
+                    state.names, state.w_ids, state.b_ids, state.enriched["date"],
+                    state.enriched["white_rating_post"].to_numpy(), state.enriched["black_rating_post"].to_numpy(),
+                    parse_results(state.enriched["result"]),
+                ))
+        return self._history[1]
+
+    def _sync(self, games: pd.DataFrame, params: tuple) -> None:
+        with perf.span("elo.row_hashes", rows=len(games)):
+            df = _prepare(games)
+            hashes = _row_hashes(df)
+        self._df = df
+        with perf.span("elo.incremental") as sp:
+            self._sync_state(df, hashes, params)
+            sp.rows = self.replayed
+
+    def _sync_state(self, df: pd.DataFrame, hashes: np.ndarray, params: tuple) -> None:
+        prev = self.state if self.state is not None and self.state.params == params else None
+        n_old = 0 if prev is None else len(prev.hashes)
+        new_cps: list[Checkpoint] = []
+
+        if prev is not None and len(df) >= n_old and np.array_equal(hashes[:n_old], prev.hashes):
+            self.last_mode = "unchanged" if len(df) == n_old else "append"
+            self.replayed = len(df) - n_old
+            self.state = apply_games(prev, df.iloc[n_old:].reset_index(drop=True), hashes[n_old:], new_cps.append)
+        else:
+            chain = _chain(hashes)
+            diverge = 0 if prev is None else _first_mismatch(prev.hashes, hashes)
+            base = self._resume_point(params, chain, hashes, prev, diverge)
+            n = len(base.hashes)
+            self.last_mode = "resume" if n else "full"
+            self.replayed = len(df) - n
+            self.state = apply_games(base, df.iloc[n:].reset_index(drop=True), hashes[n:], new_cps.append)
+
+        self._remember(params, new_cps)
+
+    def _resume_point(
+        self, params: tuple, chain: list[str], hashes: np.ndarray, prev: RatingState | None, diverge: int,
+    ) -> RatingState:
+        """Checkpoint valide le plus récent (préfixe identique à l'historique courant)."""
+        key = params_key(params)
+        memory = self._checkpoints.setdefault(key, {})
+        if self.store is not None and key not in self._stored:
+            try:
+                self._stored[key] = self.store.index(key)
+            except Exception:
+                self._stored[key] = {}
+        stored = self._stored.get(key, {})
+
+        def valid(n: int, digest: str) -> bool:
+            return n % CHECKPOINT_EVERY == 0 and 0 < n <= len(chain) * CHECKPOINT_EVERY \
+                and chain[n // CHECKPOINT_EVERY - 1] == digest
+
+        # la mémoire de l'engine prime : le stockage peut avoir été réécrit depuis par une autre session
+        candidates = stored | {n: cp.digest for n, cp in memory.items()}
+        best = max((n for n, d in candidates.items() if valid(n, d)), default=0)
+
+        # les checkpoints au-delà du point de reprise décrivent un historique périmé
+        for n in [n for n in memory if n > best]:
+            del memory[n]
+        if self.store is not None and any(n > best for n in stored):
+            self._stored[key] = {n: d for n, d in stored.items() if n <= best}
+            try:
+                self.store.discard_after(key, best)
+            except Exception:
+                pass  # les checkpoints périmés seront ignorés (empreinte différente)
+
+        while best and best not in memory:
+            try:
+                rec = self.store.load(key, best)
+            except Exception:
+                rec = None
+            if rec is not None and valid(best, rec["digest"]):
+                memory[best] = Checkpoint.from_record(rec)
+                break
+            # absent ou réécrit par une autre session (autre historique) : index relu, candidat précédent
+            try:
+                self._stored[key] = self.store.index(key)
+            except Exception:
+                self._stored[key] = {}
+            candidates = self._stored[key] | {n: cp.digest for n, cp in memory.items()}
+            best = max((n for n, d in candidates.items() if n < best and valid(n, d)), default=0)
+
+        empty = _empty_state(params, enriched_columns(self._df.iloc[:0]))
+        if best == 0:
+            return empty
+        cp = memory[best]
+        # détail des parties antérieures réutilisable si le préfixe en mémoire est intact
+        known = prev if prev is not None and not prev.enriched_offset and best <= diverge else None
+        return _state_from_checkpoint(cp, params, hashes, chain, known)
+
+    def _remember(self, params: tuple, checkpoints: list[Checkpoint]) -> None:
+        if not checkpoints:
+            return
+        key = params_key(params)
+        self._checkpoints.setdefault(key, {}).update({cp.n_games: cp for cp in checkpoints})
+        if self.store is None:
+            return
+        stored = self._stored.setdefault(key, {})
+        fresh = [cp for cp in checkpoints if stored.get(cp.n_games) != cp.digest]
+        if fresh:
+            try:
+                self.store.save(key, [cp.to_record() for cp in fresh])
+            except Exception:
+                # stockage indisponible : on garde les checkpoints en mémoire seulement
+                return
+            stored.update({cp.n_games: cp.digest for cp in fresh})
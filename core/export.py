@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import pandas as pd
+
+from core import perf
+from core.cache import LRUCache
+
+CHUNK_ROWS = 20_000   # lignes écrites par lot (mémoire constante côté écriture)
+
+FORMATS = {
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "json": ("application/json", "json"),
+}
+SHEETS = {"classement": "Classement", "historique": "Historique"}
+
+def template_partie() -> pd.DataFrame:
+    return pd.DataFrame({"date": [datetime.today().date()], "white": ["Alice"], "black": ["Bob"], "result": [1.0]})
+
+def _chunks(df: pd.DataFrame):
+    for start in range(0, len(df), CHUNK_ROWS):
+        yield df.iloc[start:start + CHUNK_ROWS]
+
+def _rows(df: pd.DataFrame):
+    """Lignes Python (NaN -> None) produites lot par lot."""
+    for chunk in _chunks(df):
+        yield from chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+
+# --------------------
+# Writers
+# --------------------
+
+def write_xlsx(path: str, ratings: pd.DataFrame, games_enriched: pd.DataFrame) -> None:
+    """XLSX en mode write_only d'openpyxl : les lignes sont sérialisées au fil de l'eau."""
+    from openpyxl import Workbook
+
+    with perf.span("export.xlsx", rows=len(games_enriched)):
+        wb = Workbook(write_only=True)
+        for name, df in (("Classement", ratings), ("Historique", games_enriched), ("TemplatePartie", template_partie())):
+            ws = wb.create_sheet(name)
+            ws.append([str(c) for c in df.columns])
+            for row in _rows(df):
+                ws.append(row)
+        wb.save(path)
+
+def write_csv(path: str, df: pd.DataFrame) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if df.empty:
+            df.to_csv(f, index=False)
+        for i, chunk in enumerate(_chunks(df)):
+            chunk.to_csv(f, index=False, header=(i == 0))
+
+def write_parquet(path: str, df: pd.DataFrame) -> None:
+    """Parquet écrit par row groups (pyarrow, installé avec streamlit)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # colonnes objet hétérogènes (ex. result saisi en texte) -> chaînes, schéma stable entre lots
+    df = df.astype({c: "string" for c in df.columns if df[c].dtype == object})
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(df):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        if df.empty:
+            writer.write_table(schema.empty_table())
+
+def write_json(path: str, df: pd.DataFrame) -> None:
+    """Tableau JSON d'objets (une ligne = un objet), écrit lot par lot ; dates au format ISO."""
+    # dates (datetime64 du détail enrichi, datetime.date) et textes -> chaînes : "2024-01-31" plutôt qu'un horodatage
+    df = df.assign(**{c: df[c].dt.strftime("%Y-%m-%d") for c in df.columns if pd.api.types.is_datetime64_any_dtype(df[c])})
+    df = df.astype({c: "string" for c in df.columns if df[c].dtype == object})
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, chunk in enumerate(_chunks(df)):
+            # objets du lot sans les crochets du tableau
+            body = chunk.to_json(orient="records", date_format="iso", force_ascii=False)[1:-1]
+            f.write(("," if i and body else "") + body)
+        f.write("]")
+
+def write_export(path: str, fmt: str, sheet: str, ratings: pd.DataFrame, games_enriched: pd.DataFrame) -> None:
+    if fmt == "xlsx":
+        return write_xlsx(path, ratings, games_enriched)
+    df = ratings if sheet == "classement" else games_enriched
+    if fmt == "csv":
+        return write_csv(path, df)
+    if fmt == "parquet":
+        return write_parquet(path, df)
+    if fmt == "json":
+        return write_json(path, df)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+# --------------------
+# Artefacts partagés + génération en tâche de fond
+# --------------------
+
+@dataclass
+class Artifact:
+    fmt: str
+    sheet: str
+    path: str
+    future: Future = field(repr=False)
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "pending"
+        return "error" if self.future.exception() else "done"
+
+    @property
+    def error(self) -> BaseException | None:
+        return self.future.exception() if self.future.done() else None
+
+    @property
+    def file_name(self) -> str:
+        base = "chessscore_export" if self.fmt == "xlsx" else f"chessscore_{self.sheet}"
+        return f"{base}.{FORMATS[self.fmt][1]}"
+
+    @property
+    def mime(self) -> str:
+        return FORMATS[self.fmt][0]
+
+class _ArtifactCache(LRUCache):
+    """LRU d'artefacts : supprime le fichier à l'éviction."""
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                _, old = self._data.popitem(last=False)
+                self.evictions += 1
+                _remove_when_done(old)
+
+def _remove_when_done(artifact: Artifact) -> None:
+    artifact.future.add_done_callback(lambda _: shutil.rmtree(os.path.dirname(artifact.path), ignore_errors=True))
+
+class ExportManager:
+    """Exports générés une fois par (empreinte des données, paramètres ELO, format) et partagés entre sessions."""
+
+    def __init__(self, max_artifacts: int = 8, workers: int = 1):
+        self.root: str | None = None   # créé au premier export (pas de répertoire pour un simple import du module)
+        self.artifacts = _ArtifactCache(maxsize=max_artifacts)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chessscore-export")
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Artifact | None:
+        return self.artifacts.get(key)
+
+    def request(self, key, fmt: str, sheet: str, ratings: pd.DataFrame, games_enriched: pd.DataFrame) -> Artifact:
+        """Renvoie l'artefact existant (en cours ou prêt) ou lance sa génération en arrière-plan."""
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        with self._lock:
+            artifact = self.artifacts.get(key)
+            # artefact prêt mais fichier supprimé (éviction concurrente) : régénéré
+            if artifact is not None and (artifact.status == "pending" or
+                                         artifact.status == "done" and os.path.exists(artifact.path)):
+                return artifact
+            if self.root is None:
+                self.root = tempfile.mkdtemp(prefix="chessscore-exports-")
+            path = os.path.join(tempfile.mkdtemp(dir=self.root), f"export.{FORMATS[fmt][1]}")
+            future = self._pool.submit(write_export, path, fmt, sheet, ratings, games_enriched)
+            artifact = Artifact(fmt, sheet, path, future)
+            self.artifacts.put(key, artifact)
+            return artifact
+
+EXPORTS = ExportManager()
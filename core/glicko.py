@@ -0,0 +1,151 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from core.elo import ENRICH_COLS, _intern_players, _rating_table, _tally
+from core.results import parse_results
+
+# Glicko-2 (Glickman) : classement + écart type (RD) + volatilité, mis à jour par période de classement.
+# Toutes les parties d'une période sont évaluées avec les classements du début de période,
+# les mises à jour sont donc vectorisées sur la période (une boucle Python par période, pas par partie).
+
+SCALE = 400.0 / math.log(10)    # 173.7178 : échelle Élo <-> échelle Glicko-2
+PERIODS = {"D": "jour", "W": "semaine", "M": "mois"}
+GLICKO_DEFAULTS = {"rd": 350, "volatility": 0.06, "tau": 0.5, "period": "W"}
+EPSILON = 1e-6                  # tolérance de l'algorithme d'Illinois (volatilité)
+
+def _period_index(dates: pd.Series, period: str) -> np.ndarray:
+    """Numéro de période calendaire de chaque partie (les écarts comptent les périodes sans partie)."""
+    d = pd.to_datetime(pd.Series(dates)).ffill().fillna(pd.Timestamp(0))   # dates manquantes : période précédente
+    if period == "D":
+        return d.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    if period == "W":
+        # semaines commençant le lundi (le 1970-01-01 est un jeudi)
+        return (d.to_numpy(dtype="datetime64[D]").astype(np.int64) + 3) // 7
+    if period == "M":
+        return d.to_numpy(dtype="datetime64[M]").astype(np.int64)
+    raise ValueError(f"Unknown rating period: {period}")
+
+def completed_until(date, period: str) -> pd.Timestamp:
+    """Dernier jour de la dernière période entièrement écoulée à la fin du jour `date` (classements définitifs)."""
+    d = pd.Timestamp(date).normalize()
+    if period == "D" or _period_index([d], period)[0] != _period_index([d + pd.Timedelta(days=1)], period)[0]:
+        return d
+    if period == "W":
+        return d - pd.Timedelta(days=d.weekday() + 1)   # dimanche précédent
+    return d.replace(day=1) - pd.Timedelta(days=1)       # fin du mois précédent
+
+def _g(phi: np.ndarray) -> np.ndarray:
+    return 1.0 / np.sqrt(1.0 + 3.0 * phi ** 2 / math.pi ** 2)
+
+def _volatility(sigma: np.ndarray, phi: np.ndarray, v: np.ndarray, delta: np.ndarray, tau: float) -> np.ndarray:
+    """Nouvelle volatilité de chaque joueur (algorithme d'Illinois, itéré sur tous les joueurs à la fois)."""
+    a = np.log(sigma ** 2)
+    d2, p2 = delta ** 2, phi ** 2
+
+    def f(x, i):
+        ex = np.exp(x)
+        return ex * (d2[i] - p2[i] - v[i] - ex) / (2.0 * (p2[i] + v[i] + ex) ** 2) - (x - a[i]) / tau ** 2
+
+    every = np.arange(len(a))
+    big = d2 > p2 + v
+    B = np.where(big, np.log(np.where(big, d2 - p2 - v, 1.0)), a - tau)
+    # encadrement : a - k·tau, k croissant tant que f reste négative
+    i = np.flatnonzero(~big)
+    k = 1
+    while len(i):
+        i = i[f(B[i], i) < 0]
+        k += 1
+        B[i] = a[i] - k * tau
+
+    A = a.copy()
+    fA, fB = f(A, every), f(B, every)
+    i = np.flatnonzero(np.abs(B - A) > EPSILON)
+    while len(i):
+        C = A[i] + (A[i] - B[i]) * fA[i] / (fB[i] - fA[i])
+        fC = f(C, i)
+        swap = fC * fB[i] <= 0
+        A[i] = np.where(swap, B[i], A[i])
+        fA[i] = np.where(swap, fB[i], fA[i] / 2.0)
+        B[i], fB[i] = C, fC
+        i = i[np.abs(B[i] - A[i]) > EPSILON]
+    return np.exp(A / 2.0)
+
+def replay_glicko(
+    df: pd.DataFrame,
+    start_rating: float,
+    rd: float,
+    volatility: float,
+    tau: float,
+    period: str,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Glicko-2 sur des parties triées (cf. core.elo._prepare) : même schéma que compute_ratings.
+
+    Colonnes du détail : *_rating_pre = classement en début de période,
+    *_rating_post = classement après la période, exp_* = score attendu
+    (pondéré par le RD de l'adversaire) et k_* = K effectif de la partie
+    (rating_post - rating_pre = somme des k·(score - exp) de la période).
+    Le classement a une colonne `rd` en plus ; le RD des joueurs inactifs
+    croît jusqu'à la dernière période de l'historique.
+    """
+    w_ids, b_ids, names = _intern_players(df)
+    s_white = parse_results(df["result"])
+    n, n_players = len(df), len(names)
+    periods = _period_index(df["date"], period)
+
+    phi0 = rd / SCALE
+    mu = np.zeros(n_players)
+    phi = np.full(n_players, phi0)
+    sigma = np.full(n_players, float(volatility))
+    last = np.full(n_players, -1, dtype=np.int64)   # dernière période jouée (-1 : jamais)
+
+    w_pre, b_pre, w_post, b_post = (np.empty(n) for _ in range(4))
+    k_w, k_b, e_w, e_b = (np.empty(n) for _ in range(4))
+
+    bounds = np.flatnonzero(np.diff(periods)) + 1
+    for lo, hi in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [n]])):
+        t = periods[lo]
+        w, b, s = w_ids[lo:hi], b_ids[lo:hi], s_white[lo:hi]
+        players, local = np.unique(np.concatenate([w, b]), return_inverse=True)
+        lw, lb = local[:hi - lo], local[hi - lo:]
+
+        # périodes sans partie depuis la dernière : le RD croît (sans dépasser le RD initial)
+        idle = np.where(last[players] >= 0, t - last[players] - 1, 0)
+        phi[players] = np.minimum(np.sqrt(phi[players] ** 2 + idle * sigma[players] ** 2), phi0)
+
+        mw, mb = mu[w], mu[b]
+        gw, gb = _g(phi[w]), _g(phi[b])
+        ew = 1.0 / (1.0 + np.exp(-gb * (mw - mb)))
+        eb = 1.0 / (1.0 + np.exp(-gw * (mb - mw)))
+
+        m = len(players)
+        inv_v = np.bincount(lw, gb ** 2 * ew * (1.0 - ew), m) + np.bincount(lb, gw ** 2 * eb * (1.0 - eb), m)
+        gain = np.bincount(lw, gb * (s - ew), m) + np.bincount(lb, gw * ((1.0 - s) - eb), m)
+        v = 1.0 / inv_v
+        sig = _volatility(sigma[players], phi[players], v, v * gain, tau)
+        phi_new = 1.0 / np.sqrt(1.0 / (phi[players] ** 2 + sig ** 2) + inv_v)
+        mu_new = mu[players] + phi_new ** 2 * gain
+
+        w_pre[lo:hi], b_pre[lo:hi] = mw, mb
+        w_post[lo:hi], b_post[lo:hi] = mu_new[lw], mu_new[lb]
+        k_w[lo:hi], k_b[lo:hi] = phi_new[lw] ** 2 * gb, phi_new[lb] ** 2 * gw
+        e_w[lo:hi], e_b[lo:hi] = ew, eb
+
+        mu[players], phi[players], sigma[players], last[players] = mu_new, phi_new, sig, t
+
+    if n:
+        phi = np.minimum(np.sqrt(phi ** 2 + (periods[-1] - last) * sigma ** 2), phi0)
+
+    def to_rating(x: np.ndarray) -> np.ndarray:
+        return start_rating + SCALE * x
+
+    enrich = dict(zip(ENRICH_COLS, [
+        to_rating(w_pre), to_rating(b_pre), to_rating(w_post), to_rating(b_post),
+        SCALE * k_w, SCALE * k_b, e_w, e_b,
+    ]))
+    counts = np.bincount(w_ids, minlength=n_players) + np.bincount(b_ids, minlength=n_players)
+    wins, losses = _tally(w_ids, b_ids, s_white, n_players)
+    table = _rating_table(names, to_rating(mu), counts, wins, losses)
+    rds = dict(zip(names, np.round(SCALE * phi, 1).tolist()))
+    return table.assign(rd=table["player"].map(rds)), df.assign(**enrich)
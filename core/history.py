@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+@dataclass
+class RatingHistory:
+    """Séries Élo par joueur, stockées à plat (une tranche contiguë par joueur).
+
+    Les évènements du joueur `i` sont `offsets[i]:offsets[i + 1]`, dans l'ordre
+    du rejeu (donc triés par date) : date, classement après la partie,
+    position de la partie dans le rejeu et bilans V/D cumulés.
+    """
+    names: list[str]
+    index: dict[str, int]
+    offsets: np.ndarray      # int64, len(names) + 1
+    dates: np.ndarray        # datetime64[ns]
+    ratings: np.ndarray      # float64, classement après la partie
+    games: np.ndarray        # int64, position de la partie dans le rejeu
+    wins: np.ndarray         # int64, victoires cumulées du joueur après la partie
+    losses: np.ndarray       # int64, défaites cumulées
+    game_dates: np.ndarray   # datetime64[ns], date de chaque partie (ordre du rejeu)
+    keys: np.ndarray         # int64, joueur * (nb parties + 1) + partie : trié, pour les recherches "à date"
+
+    @classmethod
+    def build(
+        cls,
+        names: list[str],
+        w_ids: np.ndarray,
+        b_ids: np.ndarray,
+        dates,
+        white_post: np.ndarray,
+        black_post: np.ndarray,
+        s_white: np.ndarray,
+    ) -> "RatingHistory":
+        """Regroupe les classements post-partie par joueur (tri stable, sans boucle Python)."""
+        n = len(w_ids)
+        players = np.concatenate([w_ids, b_ids]).astype(np.int64, copy=False)
+        games = np.concatenate([np.arange(n), np.arange(n)])
+        order = np.lexsort((games, players))
+        players, games = players[order], games[order]
+        offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(players, minlength=len(names)), out=offsets[1:])
+        d = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[ns]")
+
+        # bilans cumulés par joueur : cumsum global moins la valeur à l'entrée de la tranche
+        s = np.asarray(s_white, dtype=np.float64)
+        score = np.concatenate([s, 1.0 - s])[order]
+        seg_start = np.repeat(offsets[:-1], np.diff(offsets))
+        def cumulative(flags: np.ndarray) -> np.ndarray:
+            c = np.cumsum(flags, dtype=np.int64)
+            return c - np.concatenate([[0], c])[seg_start]
+        return cls(
+            names=list(names),
+            index={p: i for i, p in enumerate(names)},
+            offsets=offsets,
+            dates=np.concatenate([d, d])[order],
+            ratings=np.concatenate([np.asarray(white_post, dtype=np.float64), np.asarray(black_post, dtype=np.float64)])[order],
+            games=games,
+            wins=cumulative(score == 1.0),
+            losses=cumulative(score == 0.0),
+            game_dates=d,
+            keys=players * (n + 1) + games,
+        )
+
+    def _slice(self, player: str, start=None, end=None) -> slice:
+        i = self.index.get(str(player).strip())
+        if i is None:
+            return slice(0, 0)
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        d = self.dates[lo:hi]
+        a = np.searchsorted(d, np.datetime64(pd.Timestamp(start), "ns"), "left") if start is not None else 0
+        b = np.searchsorted(d, np.datetime64(pd.Timestamp(end), "ns"), "right") if end is not None else hi - lo
+        return slice(lo + int(a), lo + int(b))
+
+    def series(self, player: str, start=None, end=None) -> pd.DataFrame:
+        """Classement de `player` après chaque partie jouée entre `start` et `end` (inclus)."""
+        s = self._slice(player, start, end)
+        return pd.DataFrame({"date": self.dates[s], "rating": self.ratings[s], "game": self.games[s]})
+
+    def series_many(self, players, start=None, end=None) -> pd.DataFrame:
+        """Séries de plusieurs joueurs au format long (player, date, rating, game)."""
+        frames = [self.series(p, start, end).assign(player=str(p).strip()) for p in players]
+        if not frames:
+            return pd.DataFrame(columns=["player", "date", "rating", "game"])
+        return pd.concat(frames, ignore_index=True)[["player", "date", "rating", "game"]]
+
+    def games_until(self, date) -> int:
+        """Nombre de parties jouées jusqu'à `date` incluse (recherche binaire sur les dates du rejeu)."""
+        return int(np.searchsorted(self.game_dates, np.datetime64(pd.Timestamp(date), "ns"), "right"))
+
+    def state_at(self, n_games: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """État après les `n_games` premières parties, sans rejeu.
+
+        Une recherche binaire par joueur dans `keys` donne son dernier évènement
+        avant la coupure. Renvoie (ids des joueurs ayant joué, classement,
+        parties, victoires, défaites).
+        """
+        n = len(self.game_dates)
+        ids = np.arange(len(self.names), dtype=np.int64)
+        pos = np.searchsorted(self.keys, ids * (n + 1) + n_games, "left")
+        count = pos - self.offsets[:-1]
+        played = np.flatnonzero(count > 0)
+        last = pos[played] - 1
+        return played, self.ratings[last], count[played], self.wins[last], self.losses[last]
@@ -0,0 +1,135 @@
+import csv
+import re
+from dataclasses import dataclass, field
+from typing import IO, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from core.results import decode_scores, encode_results
+
+BATCH_ROWS = 10_000      # lignes normalisées / écrites par lot
+IMPORT_COLS = ["date", "white", "black", "result"]
+
+# en-têtes acceptés (CSV) -> colonnes de chessscore.games
+CSV_ALIASES = {
+    "date": "date", "jour": "date",
+    "white": "white", "blancs": "white", "blanc": "white",
+    "black": "black", "noirs": "black", "noir": "black",
+    "result": "result", "résultat": "result", "resultat": "result", "score": "result",
+}
+PGN_TAGS = {"Date": "date", "White": "white", "Black": "black", "Result": "result"}
+_PGN_TAG = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+
+# --------------------
+# Lecture en flux
+# --------------------
+
+def csv_batches(f: IO[str], batch_rows: int = BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """Lots bruts (texte) d'un CSV séparé par `,` ou `;` ; `line` = numéro de ligne dans le fichier (en-tête = 1)."""
+    header = f.readline().lstrip("\ufeff")
+    sep = ";" if header.count(";") > header.count(",") else ","
+    names = [CSV_ALIASES.get(c.strip().lower(), c.strip().lower()) for c in next(csv.reader([header], delimiter=sep), [])]
+    missing = [c for c in IMPORT_COLS if c not in names]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+    line = 2
+    for chunk in pd.read_csv(f, header=None, names=names, sep=sep, dtype=str, keep_default_na=False,
+                             chunksize=batch_rows, skip_blank_lines=False):
+        out = chunk[IMPORT_COLS].fillna("").reset_index(drop=True)
+        out.insert(0, "line", np.arange(line, line + len(out)))
+        line += len(out)
+        yield out[out[IMPORT_COLS].ne("").any(axis=1)]   # lignes vides ignorées
+
+def pgn_batches(f: IO[str], batch_rows: int = BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """Lots bruts tirés des en-têtes PGN (Date, White, Black, Result) ; les coups sont ignorés."""
+    rows, tags, start, in_tags = [], {}, None, False
+    for lineno, raw in enumerate(f, start=1):
+        m = _PGN_TAG.match(raw.strip())
+        if m:
+            if not in_tags and tags:
+                rows.append({"line": start, **tags})
+                tags = {}
+            if not in_tags:
+                start, in_tags = lineno, True
+            if m.group(1) in PGN_TAGS:
+                tags[PGN_TAGS[m.group(1)]] = m.group(2)
+        elif raw.strip():
+            in_tags = False
+        if len(rows) >= batch_rows:
+            yield pd.DataFrame(rows, columns=["line"] + IMPORT_COLS).fillna("")
+            rows = []
+    if tags:
+        rows.append({"line": start, **tags})
+    if rows:
+        yield pd.DataFrame(rows, columns=["line"] + IMPORT_COLS).fillna("")
+
+def read_batches(f: IO[str], fmt: str, batch_rows: int = BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    if fmt == "csv":
+        return csv_batches(f, batch_rows)
+    if fmt == "pgn":
+        return pgn_batches(f, batch_rows)
+    raise ValueError(f"Unknown import format: {fmt}")
+
+# --------------------
+# Normalisation vectorisée
+# --------------------
+
+def _parse_dates(col: pd.Series) -> pd.Series:
+    """ISO (2024-03-15), PGN (2024.03.15) ou français (15/03/2024) ; NaT sinon."""
+    s = col.astype(str).str.strip().str.replace(".", "-", regex=False)
+    d = pd.to_datetime(s, format="%Y-%m-%d", errors="coerce")
+    rest = d.isna()
+    if rest.any():
+        d[rest] = pd.to_datetime(s[rest], format="%d/%m/%Y", errors="coerce")
+    return d.dt.date
+
+def _normalize_names(col: pd.Series, aliases: dict[str, str]) -> pd.Series:
+    s = col.astype(str).str.strip().str.replace(r"\s+", " ", regex=True)
+    return s.replace(aliases) if aliases else s
+
+def normalize_games(raw: pd.DataFrame, aliases: dict[str, str] | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Lot brut -> (parties valides [date, white, black, result], lignes rejetées [line, ..., reason]).
+
+    Les noms sont nettoyés (espaces) et les alias ramenés au nom du joueur ;
+    les résultats passent par le codec commun (core.results).
+    """
+    out = pd.DataFrame({
+        "date": _parse_dates(raw["date"]),
+        "white": _normalize_names(raw["white"], aliases or {}),
+        "black": _normalize_names(raw["black"], aliases or {}),
+        "result": decode_scores(encode_results(raw["result"])),
+    })
+    reasons = pd.Series("", index=raw.index, dtype=object)
+    for mask, reason in (
+        (out["date"].isna(), "date invalide"),
+        (out["white"].eq("") | out["black"].eq(""), "joueur manquant"),
+        (out["white"].eq(out["black"]) & out["white"].ne(""), "même joueur des deux côtés"),
+        (out["result"].isna(), "résultat invalide"),
+    ):
+        reasons[mask & reasons.eq("")] = reason
+    bad = reasons.ne("")
+    invalid = raw.loc[bad].assign(reason=reasons[bad]).reset_index(drop=True)
+    return out.loc[~bad].reset_index(drop=True), invalid
+
+@dataclass
+class ImportReport:
+    read: int = 0
+    written: int = 0
+    invalid: list[pd.DataFrame] = field(default_factory=list)
+
+    @property
+    def rejected(self) -> pd.DataFrame:
+        if not self.invalid:
+            return pd.DataFrame(columns=["line"] + IMPORT_COLS + ["reason"])
+        return pd.concat(self.invalid, ignore_index=True)
+
+def validated(batches: Iterable[pd.DataFrame], report: ImportReport, aliases: dict[str, str] | None = None) -> Iterator[pd.DataFrame]:
+    """Normalise les lots au fil de l'eau ; les lignes rejetées sont cumulées dans `report`."""
+    for raw in batches:
+        valid, invalid = normalize_games(raw, aliases)
+        report.read += len(raw)
+        if len(invalid):
+            report.invalid.append(invalid)
+        if len(valid):
+            yield valid
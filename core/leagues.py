@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from core import perf
+from core.cache import LRUCache, dataset_fingerprint
+from core.ratings import replay, system_key
+
+DEFAULT_LEAGUE = "default"     # historique antérieur aux ligues
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+PARALLEL_MIN_GAMES = 20_000    # en dessous, lancer les process coûte plus que le rejeu
+
+# Classement par ligue, clé = (empreinte de la ligue, paramètres) : une écriture ne touche que sa ligue
+LEAGUE_TABLES = LRUCache(maxsize=256)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn : pas de fork d'un serveur Streamlit multi-thread
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _reset_executor() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def league_table(games: pd.DataFrame, params: dict) -> pd.DataFrame:
+    """Rejeu complet d'une ligue, classement seul (exécuté dans un process du pool)."""
+    return replay(games, params)[0]
+
+def league_tables(frames: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+    """Classement de chaque ligue ; les ligues à recalculer sont rejouées en parallèle.
+
+    Les ligues sont indépendantes : seules celles dont l'empreinte a changé
+    depuis le dernier appel sont rejouées, les autres viennent du cache.
+    """
+    keys = {lg: ("league-table", dataset_fingerprint(games), system_key(params)) for lg, games in frames.items()}
+    out = {lg: LEAGUE_TABLES.get(key) for lg, key in keys.items()}
+    todo = [lg for lg, table in out.items() if table is None]
+    rows = sum(len(frames[lg]) for lg in todo)
+    with perf.span("leagues.compute", rows=rows):
+        if len(todo) > 1 and rows >= PARALLEL_MIN_GAMES and MAX_WORKERS > 1:
+            try:
+                futures = {lg: _executor().submit(league_table, frames[lg], dict(params)) for lg in todo}
+                out.update({lg: f.result() for lg, f in futures.items()})
+            except BrokenProcessPool:
+                # process tué (mémoire, arrêt) : pool recréé au prochain appel, rejeu ici
+                _reset_executor()
+        for lg in todo:
+            if out[lg] is None:
+                out[lg] = league_table(frames[lg], params)
+    for lg in todo:
+        LEAGUE_TABLES.put(keys[lg], out[lg])
+    return out
+
+def league_summary(frames: dict[str, pd.DataFrame], tables: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Une ligne par ligue : parties, joueurs, meneur et son classement."""
+    rows = []
+    for lg, table in tables.items():
+        top = table.iloc[0] if len(table) else None
+        rows.append({
+            "league": lg,
+            "games": len(frames[lg]),
+            "players": len(table),
+            "leader": None if top is None else top["player"],
+            "rating": None if top is None else top["rating"],
+        })
+    return pd.DataFrame(rows, columns=["league", "games", "players", "leader", "rating"]).sort_values("league", ignore_index=True)
@@ -0,0 +1,108 @@
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+LOGGER = logging.getLogger("chessscore.perf")
+if not LOGGER.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+    LOGGER.addHandler(_handler)
+    LOGGER.setLevel(logging.INFO)
+    LOGGER.propagate = False
+
+MAX_RERUNS = 50       # reruns récents gardés pour le panneau Admin
+MAX_SAMPLES = 500     # durées gardées par span pour les percentiles
+
+@dataclass
+class Span:
+    name: str
+    ms: float = 0.0
+    rows: int | None = None
+
+@dataclass
+class Rerun:
+    label: str
+    started: datetime = field(default_factory=datetime.now)
+    t0: float = field(default_factory=time.perf_counter)
+    spans: list[Span] = field(default_factory=list)
+    total_ms: float | None = None
+
+_current: contextvars.ContextVar[Rerun | None] = contextvars.ContextVar("chessscore_rerun", default=None)
+_lock = threading.Lock()
+_reruns: deque[Rerun] = deque(maxlen=MAX_RERUNS)
+_samples: dict[str, deque[float]] = {}
+_last_rows: dict[str, int | None] = {}
+
+@contextmanager
+def span(name: str, rows: int | None = None):
+    """Mesure un bloc ; `rows` peut être renseigné après coup via le Span renvoyé."""
+    s = Span(name, rows=rows)
+    t0 = time.perf_counter()
+    try:
+        yield s
+    finally:
+        s.ms = (time.perf_counter() - t0) * 1000.0
+        with _lock:
+            _samples.setdefault(name, deque(maxlen=MAX_SAMPLES)).append(s.ms)
+            _last_rows[name] = s.rows
+        rerun = _current.get()
+        if rerun is not None:
+            rerun.spans.append(s)
+
+def begin_rerun(label: str = "rerun") -> Rerun:
+    rerun = Rerun(label)
+    _current.set(rerun)
+    return rerun
+
+def finish_rerun(rerun: Rerun | None) -> None:
+    """Clôt un rerun (même interrompu par st.rerun/st.stop) et émet une ligne de log JSON."""
+    if rerun is None or rerun.total_ms is not None:
+        return
+    rerun.total_ms = (time.perf_counter() - rerun.t0) * 1000.0
+    if _current.get() is rerun:
+        _current.set(None)
+    with _lock:
+        _reruns.append(rerun)
+    LOGGER.info(json.dumps({
+        "event": "rerun",
+        "label": rerun.label,
+        "started": rerun.started.isoformat(timespec="seconds"),
+        "total_ms": round(rerun.total_ms, 2),
+        "spans": [{"name": s.name, "ms": round(s.ms, 2), "rows": s.rows} for s in rerun.spans],
+    }))
+
+def span_summary() -> pd.DataFrame:
+    """Appels, p50 / p95 (ms) et dernier nombre de lignes par span."""
+    with _lock:
+        rows = [
+            {
+                "span": name,
+                "calls": len(samples),
+                "p50_ms": float(np.percentile(samples, 50)),
+                "p95_ms": float(np.percentile(samples, 95)),
+                "last_rows": _last_rows.get(name),
+            }
+            for name, samples in _samples.items() if samples
+        ]
+    return pd.DataFrame(rows, columns=["span", "calls", "p50_ms", "p95_ms", "last_rows"]).sort_values("p95_ms", ascending=False)
+
+def recent_reruns() -> pd.DataFrame:
+    """Un rerun par ligne (le plus récent en haut), une colonne de durée (ms) par span."""
+    with _lock:
+        reruns = list(_reruns)
+    rows = []
+    for r in reversed(reruns):
+        row = {"started": r.started, "label": r.label, "total_ms": r.total_ms}
+        for s in r.spans:
+            row[s.name] = row.get(s.name, 0.0) + s.ms
+        rows.append(row)
+    return pd.DataFrame(rows)
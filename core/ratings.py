@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from core import perf
+from core.cache import RATINGS, dataset_fingerprint
+from core.elo import _compute_ratings_arrays, _empty_result, _intern_players, _prepare
+from core.glicko import GLICKO_DEFAULTS, completed_until, replay_glicko
+from core.history import RatingHistory
+from core.results import parse_results
+
+@dataclass(frozen=True)
+class RatingSystem:
+    """Système de classement : parties triées (core.elo._prepare) + paramètres -> (classement, détail par partie).
+
+    Le classement a au moins les colonnes de compute_ratings (player, rating,
+    games, wins, draws, losses) et le détail les colonnes ENRICH_COLS.
+    """
+    label: str
+    params: list[str]                       # clés lues dans le dict de paramètres, dans l'ordre de `replay`
+    replay: Callable[..., tuple[pd.DataFrame, pd.DataFrame]]
+
+SYSTEMS = {
+    "elo": RatingSystem("Élo", ["start_rating", "base_k", "newbie_games", "newbie_k"], _compute_ratings_arrays),
+    "glicko2": RatingSystem("Glicko-2", ["start_rating", "rd", "volatility", "tau", "period"], replay_glicko),
+}
+DEFAULT_SYSTEM = "elo"
+# paramètres par défaut de tous les systèmes (app et CLI)
+DEFAULT_PARAMS = {
+    "system": DEFAULT_SYSTEM,
+    "start_rating": 1200,
+    "base_k": 20,
+    "newbie_games": 10,
+    "newbie_k": 40,
+    **GLICKO_DEFAULTS,
+}
+
+def system_of(params: dict) -> str:
+    return params.get("system", DEFAULT_SYSTEM)
+
+def system_key(params: dict) -> tuple:
+    """(système, valeurs de ses paramètres) : clé de cache, indépendante des paramètres des autres systèmes."""
+    system = system_of(params)
+    if system not in SYSTEMS:
+        raise ValueError(f"Unknown rating system: {system}")
+    return (system,) + tuple(params.get(k, GLICKO_DEFAULTS.get(k)) for k in SYSTEMS[system].params)
+
+def replay(games: pd.DataFrame, params: dict) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Rejeu complet, sans cache."""
+    if games.empty:
+        return _empty_result(games.copy())
+    system, *values = system_key(params)
+    return SYSTEMS[system].replay(_prepare(games), *values)
+
+def rate(games: pd.DataFrame, params: dict) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Classement + détail du système choisi, mis en cache (LRU partagé) ; ne pas modifier en place."""
+    key = ("rate", dataset_fingerprint(games), system_key(params))
+
+    def compute():
+        with perf.span(f"ratings.{system_of(params)}", rows=len(games)):
+            return replay(games, params)
+    return RATINGS.get_or_compute(key, compute)
+
+def rating_history(games: pd.DataFrame, params: dict) -> RatingHistory:
+    """Séries par joueur tirées du détail (classements post-partie), quel que soit le système."""
+    key = ("rate-history", dataset_fingerprint(games), system_key(params))
+
+    def build():
+        enriched = rate(games, params)[1]
+        w_ids, b_ids, names = _intern_players(enriched)
+        return RatingHistory.build(
+            names, w_ids, b_ids, enriched["date"],
+            enriched["white_rating_post"].to_numpy(), enriched["black_rating_post"].to_numpy(),
+            parse_results(enriched["result"]),
+        )
+    return RATINGS.get_or_compute(key, build)
+
+def as_of_cutoff(params: dict, date) -> pd.Timestamp:
+    """Date à laquelle lire le classement « au `date` » dans rating_history.
+
+    Glicko-2 : le classement post-partie est celui de fin de période, on s'arrête
+    donc à la dernière période complète (sinon des parties postérieures à `date`
+    dans la même période compteraient).
+    """
+    if system_of(params) == "glicko2":
+        return completed_until(date, params.get("period", GLICKO_DEFAULTS["period"]))
+    return pd.Timestamp(date)
+
+STAT_COLS = ["games", "wins", "draws", "losses"]
+
+def with_stats(table: pd.DataFrame, stats: pd.DataFrame) -> pd.DataFrame:
+    """Classement dont les bilans viennent de `stats` (agrégats côté base, cf. db.repo.load_player_stats).
+
+    Seuls player / rating (et les colonnes propres au système, ex. rd) sont
+    repris de `table` ; l'ordre des lignes est conservé.
+    """
+    extra = [c for c in table.columns if c not in ["player", "rating"] + STAT_COLS]
+    out = table[["player", "rating"]].merge(stats[["player"] + STAT_COLS], on="player", how="left")
+    out[STAT_COLS] = out[STAT_COLS].fillna(0).astype(np.int64)   # joueur absent : bilans pas encore relus
+    for c in extra:
+        out[c] = table[c].to_numpy()
+    return out
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+# Codes compacts (int8) : score des blancs = code / 2
+BLACK, DRAW, WHITE, INVALID = 0, 1, 2, -1
+SCORES = np.array([0.0, 0.5, 1.0])
+EMOJIS = np.array(["⚫", "🤝", "⚪"], dtype=object)
+
+# Graphies acceptées (comparées en minuscules, sans espaces)
+ALIASES = {
+    **dict.fromkeys(["1", "1.0", "1-0", "w", "white", "blancs", "⚪", "⚪️"], WHITE),
+    **dict.fromkeys(["0", "0.0", "0-1", "b", "black", "noirs", "⚫", "⚫️"], BLACK),
+    **dict.fromkeys(["0.5", "0,5", "½", "0.5-0.5", "1/2-1/2", "½-½", "d", "draw", "nulle", "=", "🤝"], DRAW),
+}
+_SCORE_CODES = {0.0: BLACK, 0.5: DRAW, 1.0: WHITE}
+
+class InvalidResultsError(ValueError):
+    """Résultats non reconnus ; `rows` = positions (0-based) et valeurs fautives."""
+
+    def __init__(self, rows: pd.Series):
+        self.rows = rows
+        sample = ", ".join(f"#{i}: {v!r}" for i, v in rows.head(10).items())
+        more = f" (+{len(rows) - 10})" if len(rows) > 10 else ""
+        super().__init__(f"Invalid result in {len(rows)} row(s): {sample}{more}")
+
+def _code_for(value) -> int:
+    s = str(value).replace(" ", "").lower()
+    if s in ALIASES:
+        return ALIASES[s]
+    try:
+        return _SCORE_CODES.get(float(s.replace(",", ".")), INVALID)
+    except ValueError:
+        return INVALID
+
+def encode_results(col: pd.Series) -> np.ndarray:
+    """Colonne de résultats (toute graphie acceptée) -> codes int8, INVALID si non reconnu ou manquant.
+
+    Chemin rapide numérique vectorisé ; les autres cellules sont factorisées et
+    seules les graphies distinctes passent par Python.
+    """
+    values = col.to_numpy(dtype=object) if not pd.api.types.is_numeric_dtype(col) else col.to_numpy()
+    num = pd.to_numeric(col, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    codes = np.full(len(col), INVALID, dtype=np.int8)
+    codes[num == 0.0] = BLACK
+    codes[num == 0.5] = DRAW
+    codes[num == 1.0] = WHITE
+
+    rest = np.flatnonzero(np.isnan(num) & pd.notna(values))
+    if len(rest):
+        uniq_idx, uniques = pd.factorize(pd.Series(values[rest], dtype=object).astype(str))
+        lookup = np.array([_code_for(u) for u in uniques], dtype=np.int8)
+        codes[rest] = lookup[uniq_idx]
+    return codes
+
+def invalid_rows(col: pd.Series, codes: np.ndarray | None = None) -> pd.Series:
+    """Valeurs non reconnues, indexées par position dans la colonne."""
+    codes = encode_results(col) if codes is None else codes
+    bad = np.flatnonzero(codes == INVALID)
+    return pd.Series(col.to_numpy(dtype=object)[bad], index=bad, dtype=object)
+
+def decode_scores(codes: np.ndarray) -> np.ndarray:
+    """Codes -> score des blancs (1.0 / 0.5 / 0.0), NaN pour INVALID."""
+    return np.where(codes >= 0, SCORES[np.clip(codes, 0, 2)], np.nan)
+
+def parse_results(col: pd.Series) -> np.ndarray:
+    """Score des blancs (float64) ; lève InvalidResultsError listant toutes les lignes invalides."""
+    codes = encode_results(col)
+    if (codes == INVALID).any():
+        raise InvalidResultsError(invalid_rows(col, codes))
+    return SCORES[codes]
+
+def to_emojis(col: pd.Series) -> pd.Series:
+    """Affichage éditeur : ⚪ / 🤝 / ⚫, la valeur d'origine si non reconnue."""
+    codes = encode_results(col)
+    out = np.where(codes >= 0, EMOJIS[np.clip(codes, 0, 2)], col.to_numpy(dtype=object))
+    return pd.Series(out, index=col.index, dtype=object)
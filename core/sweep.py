@@ -0,0 +1,67 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from core.elo import _intern_players, _prepare, _rating_table, _tally
+from core.results import parse_results
+
+PARAM_NAMES = ["start_rating", "base_k", "newbie_games", "newbie_k"]
+
+def param_grid(
+    start_rating: list[int],
+    base_k: list[int],
+    newbie_games: list[int],
+    newbie_k: list[int],
+) -> list[dict]:
+    """Produit cartésien des valeurs candidates, une combinaison par dict."""
+    return [dict(zip(PARAM_NAMES, combo)) for combo in itertools.product(start_rating, base_k, newbie_games, newbie_k)]
+
+def sweep_ratings(games: pd.DataFrame, grid: list[dict]) -> tuple[pd.DataFrame, list[pd.DataFrame]]:
+    """Évalue toutes les combinaisons de `grid` en une seule passe sur les parties.
+
+    Les classements sont tenus dans une matrice (joueurs × combinaisons) ; chaque
+    partie met à jour les C combinaisons d'un coup. Renvoie (scores, tables) :
+    scores = une ligne par combinaison (paramètres, log_loss, brier) et
+    tables[i] = classement de la combinaison i (même schéma que compute_ratings).
+    """
+    scores = pd.DataFrame(grid, columns=PARAM_NAMES)
+    if games.empty or not grid:
+        empty = pd.DataFrame(columns=["player","rating","games","wins","draws","losses"])
+        return scores.assign(log_loss=np.nan, brier=np.nan), [empty.copy() for _ in grid]
+
+    df = _prepare(games)
+    w_ids, b_ids, names = _intern_players(df)
+    s_white = parse_results(df["result"])
+    n_players = len(names)
+
+    start = scores["start_rating"].to_numpy(dtype=np.float64)
+    base_k = scores["base_k"].to_numpy(dtype=np.float64)
+    newbie_games = scores["newbie_games"].to_numpy()
+    newbie_k = scores["newbie_k"].to_numpy(dtype=np.float64)
+
+    ratings = np.tile(start, (n_players, 1))          # (joueurs, combinaisons), ligne contiguë par joueur
+    counts = np.zeros(n_players, dtype=np.int64)      # indépendant des paramètres
+    log_loss = np.zeros(len(grid))
+    brier = np.zeros(len(grid))
+    eps = 1e-12
+
+    for w, b, s in zip(w_ids.tolist(), b_ids.tolist(), s_white.tolist()):
+        rw, rb = ratings[w], ratings[b]
+        ew = 1.0 / (1.0 + 10 ** ((rb - rw) / 400.0))
+        k_w = np.where(counts[w] < newbie_games, newbie_k, base_k)
+        k_b = np.where(counts[b] < newbie_games, newbie_k, base_k)
+
+        e = np.clip(ew, eps, 1.0 - eps)
+        log_loss -= s * np.log(e) + (1.0 - s) * np.log(1.0 - e)
+        brier += (ew - s) ** 2
+
+        ratings[w] = rw + k_w * (s - ew)
+        ratings[b] = rb + k_b * ((1.0 - s) - (1.0 - ew))
+        counts[w] += 1
+        counts[b] += 1
+
+    n = len(df)
+    wins, losses = _tally(w_ids, b_ids, s_white, n_players)
+    tables = [_rating_table(names, ratings[:, c], counts, wins, losses) for c in range(len(grid))]
+    return scores.assign(log_loss=log_loss / n, brier=brier / n), tables
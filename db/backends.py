@@ -0,0 +1,66 @@
+import os
+import sqlite3
+
+from sqlalchemy import create_engine, event, make_url, text
+from sqlalchemy.pool import QueuePool
+
+# Backends de stockage : Postgres (DB_URL postgresql+psycopg://...) ou SQLite embarqué (DB_URL sqlite:///chemin.db).
+# Les deux exposent le schéma `chessscore` ; db.repo ne voit qu'un moteur SQLAlchemy.
+
+SCHEMA_DIR = os.path.dirname(__file__)
+SCHEMAS = {"postgresql": "schema.sql", "sqlite": "schema_sqlite.sql"}
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+def sqlite_engine(path: str, pool_pre_ping: bool = False):
+    """SQLite embarqué : le fichier `path` est attaché sous le nom `chessscore` sur chaque connexion."""
+    path = os.path.abspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # base principale en mémoire : SQLAlchemy choisirait SingletonThreadPool (une connexion par thread,
+    # fermée par d'autres threads) ; Streamlit ouvre un thread par rerun -> vrai pool partagé entre threads
+    eng = create_engine("sqlite://", poolclass=QueuePool, pool_pre_ping=pool_pre_ping,
+                        connect_args={"check_same_thread": False})
+
+    @event.listens_for(eng, "connect")
+    def _connect(dbapi_con, _):
+        # transactions gérées par SQLAlchemy (BEGIN explicite) : savepoints fiables avec pysqlite
+        dbapi_con.isolation_level = None
+        dbapi_con.execute(f"attach database '{path}' as chessscore")
+        dbapi_con.execute("pragma chessscore.journal_mode = wal")
+        dbapi_con.execute("pragma chessscore.synchronous = normal")
+        dbapi_con.execute("pragma busy_timeout = 5000")
+
+    @event.listens_for(eng, "begin")
+    def _begin(con):
+        con.exec_driver_sql("begin")
+
+    return eng
+
+def make_engine(url: str, options: dict):
+    """Moteur SQLAlchemy pour DB_URL ; `options` = réglages de pool (cf. db.repo.engine_options)."""
+    if is_sqlite(url):
+        return sqlite_engine(make_url(url).database or "chessscore.db", options.get("pool_pre_ping", False))
+    return create_engine(url, **options)
+
+def _statements(sql: str) -> list[str]:
+    """Découpe un script en requêtes (les corps de déclencheurs `begin ... end;` restent entiers)."""
+    out, buf = [], ""
+    for line in sql.splitlines(keepends=True):
+        if not buf and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        buf += line
+        if sqlite3.complete_statement(buf):
+            out.append(buf.strip())
+            buf = ""
+    return out
+
+def apply_schema(eng) -> None:
+    """Crée tables, index et déclencheurs (idempotent)."""
+    sql = open(os.path.join(SCHEMA_DIR, SCHEMAS[eng.dialect.name]), encoding="utf-8").read()
+    with eng.begin() as con:
+        if eng.dialect.name == "postgresql":
+            con.exec_driver_sql(sql)
+        else:
+            for stmt in _statements(sql):
+                con.execute(text(stmt))
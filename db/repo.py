@@ -1,50 +1,582 @@
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
 import pandas as pd
-import streamlit as st
-from sqlalchemy import create_engine, text
+from sqlalchemy import bindparam, text
+
+from core import perf
+from core.cache import LRUCache
+from core.elo import CheckpointStore
+from core.leagues import DEFAULT_LEAGUE
+from core.results import InvalidResultsError, decode_scores, encode_results, parse_results
+from db.backends import apply_schema, is_sqlite, make_engine
+
+# Pool : valeurs par défaut, surchargeables dans la configuration (DB_POOL_SIZE, ...)
+POOL_DEFAULTS = {
+    "pool_size": 5,          # connexions gardées ouvertes
+    "max_overflow": 10,      # connexions supplémentaires en pic
+    "pool_timeout": 30,      # s d'attente d'une connexion libre
+    "pool_recycle": 1800,    # s avant de recycler une connexion (coupures côté serveur / pooler)
+    "pool_pre_ping": True,   # "select 1" à chaque emprunt : à couper si pool_recycle suffit
+}
+
+def engine_options(url: str, conf) -> dict:
+    """Options create_engine à partir de `conf` (secrets ou dict) : clés DB_POOL_SIZE, DB_MAX_OVERFLOW, ..."""
+    opts = {}
+    for name, default in POOL_DEFAULTS.items():
+        raw = conf.get("DB_" + name.upper(), default)
+        opts[name] = str(raw).strip().lower() in ("1", "true", "yes", "on") if isinstance(default, bool) else int(raw)
+    if is_sqlite(url):
+        # SQLite embarqué : pas de dimensionnement de pool
+        opts = {"pool_pre_ping": opts["pool_pre_ping"]}
+    return opts
+
+def get_engine(conf=None):
+    """Moteur décrit par `conf` (DB_URL, DB_POOL_*) ; par défaut les secrets Streamlit.
 
-def get_engine():
-    url = st.secrets.get("DB_URL")
+    Streamlit n'est importé que dans ce cas : la CLI (python -m chessscore) passe sa propre configuration.
+    """
+    if conf is None:
+        import streamlit as st
+        conf = st.secrets
+    url = conf.get("DB_URL")
     if not url:
-        raise RuntimeError("Missing DB_URL in Streamlit secrets")
-    return create_engine(url, pool_pre_ping=True)
+        raise RuntimeError("Missing DB_URL (Streamlit secrets, environment or config file)")
+    return make_engine(url, engine_options(url, conf))
 
-@st.cache_resource
-def engine():
+@functools.cache   # un moteur (et son pool) par process
+def _default_engine():
     return get_engine()
 
+_engine_override = None
+_initialized: set[int] = set()
+_init_lock = threading.Lock()
+
+def use_engine(eng):
+    """Remplace le moteur SQLAlchemy (benchmarks, scripts) ; None = retour à DB_URL."""
+    global _engine_override
+    _engine_override = eng
+    games_store().invalidate()
+
+def engine():
+    return _engine_override if _engine_override is not None else _default_engine()
+
 def init_db():
+    """Vérifie la connexion une seule fois par processus et par moteur (les requêtes qualifient le schéma).
+
+    SQLite embarqué : crée aussi le schéma (aucune installation préalable).
+    """
+    eng = engine()
+    if id(eng) in _initialized:
+        return
+    with _init_lock:
+        if id(eng) not in _initialized:
+            if eng.dialect.name == "sqlite":
+                apply_schema(eng)
+            with eng.connect() as con:
+                _has_checkpoint_table(con)
+            _initialized.add(id(eng))
+
+@contextmanager
+def _pipeline(con):
+    """Mode pipeline psycopg : les requêtes de la transaction partent sans attendre chaque réponse."""
+    raw = con.connection.driver_connection
+    if con.dialect.driver == "psycopg" and hasattr(raw, "pipeline"):
+        with raw.pipeline():
+            yield
+    else:
+        yield
+
+# Historique en mémoire (partagé entre sessions) + chargement différentiel
+GAMES_QUERY = "select id, league, date, white, black, result{extra} from chessscore.games{where} order by date desc, id desc"
+REFRESH_SECONDS = 2.0        # âge max avant de redemander les changements (autres sessions)
+WATERMARK_OVERLAP = "5 seconds"   # recouvrement pour les transactions validées après notre lecture
+
+class GamesStore:
+    """Copie en mémoire de chessscore.games rafraîchie par différentiel.
+
+    Le filigrane est le plus grand `updated_at` vu (parties) et le plus grand
+    `deleted_at` (table games_tombstones) ; un rafraîchissement ne lit que les
+    lignes modifiées/supprimées depuis. Rechargement complet seulement après
+    invalidate() ou si le schéma ne connaît pas ces colonnes.
+
+    Chaque ligue a sa propre frame (`leagues`), republiée seulement quand un
+    différentiel la touche : l'empreinte des autres ligues ne change pas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.df: pd.DataFrame | None = None
+        self.leagues: dict[str, pd.DataFrame] = {}   # ligue -> parties (sans colonne league)
+        self.games_wm = None
+        self.tombs_wm = None
+        self.supports_delta = True
+        self.revision = 0            # incrémentée à chaque changement du frame (empreinte des caches)
+        self._version = None
+        self._refreshed_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self.df = None
+
+    def frame(self, version: int, league: str | None = None) -> pd.DataFrame:
+        """Historique trié (date desc, id desc), toutes ligues ou celles de `league` ; ne pas modifier en place."""
+        with self._lock:
+            fresh = version == self._version and time.monotonic() - self._refreshed_at < REFRESH_SECONDS
+            if self.df is None:
+                self._full_reload()
+            elif not fresh:
+                self._refresh()
+            self._version, self._refreshed_at = version, time.monotonic()
+            if league is None:
+                return self.df
+            part = self.leagues.get(league)
+            return part if part is not None else self._empty_league(league)
+
+    def _empty_league(self, league: str) -> pd.DataFrame:
+        df = self.df.iloc[:0].drop(columns="league")
+        df.attrs["revision"] = (league, 0)
+        return df
+
+    def _full_reload(self):
+        with perf.span("db.load_games.full") as sp:
+            self._full_reload_inner()
+            sp.rows = len(self.df)
+
+    def _full_reload_inner(self):
+        try:
+            df = pd.read_sql(GAMES_QUERY.format(extra=", updated_at", where=""), engine())
+            tombs_wm = pd.read_sql("select max(deleted_at) as wm from chessscore.games_tombstones", engine())["wm"].iat[0]
+            self.supports_delta = True
+        except Exception:
+            # schéma sans updated_at / tombstones : lecture complète à chaque rafraîchissement
+            df = pd.read_sql(GAMES_QUERY.format(extra=", null as updated_at", where=""), engine())
+            tombs_wm, self.supports_delta = None, False
+        self.games_wm = df["updated_at"].max() if len(df) else None
+        self.tombs_wm = tombs_wm
+        self._publish(df.drop(columns="updated_at"))
+
+    def _publish(self, df: pd.DataFrame, touched: set[str] | None = None):
+        """Publie le frame ; `touched` = ligues modifiées (None : toutes)."""
+        self.revision += 1
+        df.attrs["revision"] = self.revision
+        if touched is None:
+            leagues = {}
+            parts = {lg: part for lg, part in df.groupby("league", sort=False)}
+        else:
+            leagues = dict(self.leagues)
+            parts = {lg: df[df["league"] == lg] for lg in touched}
+        for lg, part in parts.items():
+            part = part.drop(columns="league").reset_index(drop=True)
+            part.attrs["revision"] = (lg, self.revision)
+            leagues[lg] = part
+        # dict neuf remplacé d'un bloc : un lecteur hors verrou n'en voit jamais un à moitié rempli
+        self.leagues, self.df = leagues, df
+
+    def _refresh(self):
+        if not self.supports_delta:
+            return self._full_reload()
+        with perf.span("db.load_games.delta") as sp:
+            sp.rows = self._refresh_inner()
+
+    def _refresh_inner(self) -> int:
+        """Applique le différentiel ; renvoie le nombre de lignes lues."""
+        since = (f"> cast(:wm as timestamptz) - interval '{WATERMARK_OVERLAP}'" if engine().dialect.name == "postgresql"
+                 else f"> datetime(:wm, '-{WATERMARK_OVERLAP}')")
+        delta = pd.read_sql(
+            text(GAMES_QUERY.format(extra=", updated_at", where=f" where updated_at {since}" if self.games_wm is not None else "")),
+            engine(), params={"wm": str(self.games_wm)} if self.games_wm is not None else None,
+        )
+        tombs = pd.read_sql(
+            text("select id, deleted_at from chessscore.games_tombstones"
+                 + (f" where deleted_at {since}" if self.tombs_wm is not None else "")),
+            engine(), params={"wm": str(self.tombs_wm)} if self.tombs_wm is not None else None,
+        )
+        if delta.empty and tombs.empty:
+            return 0
+        if len(delta):
+            self.games_wm = max(x for x in (self.games_wm, delta["updated_at"].max()) if x is not None)
+        if len(tombs):
+            self.tombs_wm = max(x for x in (self.tombs_wm, tombs["deleted_at"].max()) if x is not None)
+
+        # le recouvrement du filigrane relit des lignes déjà connues : seules les lignes réellement
+        # modifiées désignent les ligues à republier
+        cols = ["id", "league"] + GAME_COLS
+        known = self.df.loc[self.df["id"].isin(delta["id"]), cols]
+        new = delta[cols].merge(known, how="left", indicator=True)["_merge"].eq("left_only").to_numpy()
+        changed = pd.concat([delta.loc[new, "id"], tombs["id"]], ignore_index=True)
+        touched = set(delta.loc[new, "league"]) | set(self.df.loc[self.df["id"].isin(changed), "league"])
+        if not touched:
+            return len(delta) + len(tombs)
+        gone = pd.concat([delta["id"], tombs["id"]], ignore_index=True)
+        kept = self.df[~self.df["id"].isin(gone)]
+        merged = pd.concat([kept, delta.drop(columns="updated_at")], ignore_index=True) if len(delta) else kept
+        self._publish(merged.sort_values(["date", "id"], ascending=False, kind="stable").reset_index(drop=True), touched)
+        return len(delta) + len(tombs)
+
+@functools.cache   # partagé par toutes les sessions du process
+def games_store() -> GamesStore:
+    return GamesStore()
+
+def load_games(version: int, league: str | None = None) -> pd.DataFrame:
+    """Parties d'une ligue (sans colonne league), ou de toutes si `league` est None."""
+    return games_store().frame(version, league)
+
+def load_league_games(version: int) -> dict[str, pd.DataFrame]:
+    """Parties de chaque ligue non vide."""
+    store = games_store()
+    store.frame(version)
+    leagues = store.leagues   # jamais modifié après publication (cf. GamesStore._publish)
+    return {lg: df for lg, df in leagues.items() if len(df)}
+
+def load_leagues(version: int) -> list[str]:
+    """Ligues connues (parties ou joueurs), la ligue par défaut toujours comprise."""
+    players = load_players(version)
+    return sorted(set(load_league_games(version)) | set(players["league"]) | {DEFAULT_LEAGUE})
+
+def invalidate_games():
+    """Force un rechargement complet au prochain load_games."""
+    games_store().invalidate()
+
+HISTORY_PAGE_ROWS = 50
+
+def load_games_page(
+    league: str,
+    cursor: tuple | None = None,
+    limit: int = HISTORY_PAGE_ROWS,
+    player: str | None = None,
+    start=None,
+    end=None,
+) -> tuple[pd.DataFrame, tuple | None]:
+    """Une page de l'historique d'une ligue (date desc, id desc), filtrée côté base.
+
+    Pagination keyset : `cursor` = (date, id) de la dernière ligne de la page
+    précédente (None = première page). Renvoie (page, curseur de la page
+    suivante ou None) ; le coût ne dépend que de `limit`, pas de la taille de
+    l'historique (index games_league_date_id_idx).
+    """
+    where, params = ["league = :l"], {"l": league, "n": limit + 1}
+    if player:
+        where.append("(trim(white) = :p or trim(black) = :p)")   # mêmes noms que PLAYER_STATS_QUERY
+        params["p"] = player
+    if start is not None:
+        where.append("date >= :start")
+        params["start"] = str(start)
+    if end is not None:
+        where.append("date <= :end")
+        params["end"] = str(end)
+    if cursor is not None:
+        where.append("(date, id) < (:c_date, :c_id)")
+        params.update(c_date=str(cursor[0]), c_id=int(cursor[1]))
+    q = f"""
+        select id, date, white, black, result from chessscore.games
+        where {" and ".join(where)}
+        order by date desc, id desc
+        limit :n
+    """
+    with perf.span("db.games_page") as sp:
+        df = pd.read_sql(text(q), engine(), params=params)
+        sp.rows = len(df)
+    df["date"] = pd.to_datetime(df["date"]).dt.date
+    # une ligne de plus que la page : il existe une page suivante
+    if len(df) <= limit:
+        return df, None
+    df = df.iloc[:limit]
+    return df, (df["date"].iat[-1], int(df["id"].iat[-1]))
+
+
+def save_game_row(date, white, black, result, league: str = DEFAULT_LEAGUE):
+    with engine().begin() as con:
+        _has_checkpoint_table(con)   # sondé avant le pipeline (aucune lecture de résultat en mode pipeline)
+        with _pipeline(con):
+            con.execute(text("""
+                insert into chessscore.games(league, date, white, black, result)
+                values (:l, :d, :w, :b, :r)
+            """), {"l": league, "d": str(date), "w": white, "b": black, "r": float(parse_results(pd.Series([result]))[0])})
+            # les checkpoints de la ligue postérieurs à la partie ne décrivent plus l'historique
+            _discard_checkpoints_after_date(con, date, league)
+
+def save_games_df(df: pd.DataFrame, league: str = DEFAULT_LEAGUE):
+    """Remplace l'historique de `league` par `df` (les autres ligues ne sont pas touchées)."""
+    if "result" in df.columns:
+        df = df.assign(result=parse_results(df["result"]))   # 1.0 / 0.5 / 0.0 ; lignes invalides signalées en bloc
+    df = df.assign(league=league)
     with engine().begin() as con:
-        con.execute(text("set search_path to chessscore, public;"))
+        con.execute(text("delete from chessscore.games where league = :l"), {"l": league})
+        df.to_sql("games", con, if_exists="append", index=False, schema="chessscore", method="multi", chunksize=1000)
+    # remplacement en bloc : rechargement complet plutôt qu'un différentiel de toute la ligue
+    invalidate_games()
+
+# Historique : persistance par différentiel (clé = id)
+GAME_COLS = ["date", "white", "black", "result"]
+
+@dataclass
+class GameChanges:
+    inserted: pd.DataFrame   # nouvelles lignes (sans id)
+    updated: pd.DataFrame    # lignes modifiées (avec id)
+    deleted: list[int]       # ids supprimés
+    earliest_date: object    # plus ancienne date touchée (avant ou après modification), None si rien
+
+    @property
+    def empty(self) -> bool:
+        return self.inserted.empty and self.updated.empty and not self.deleted
 
-# @st.cache_data(show_spinner=False)
-def load_games(version: int) -> pd.DataFrame:
-    q = "select id, date, white, black, result from chessscore.games order by date desc, id desc"
-    return pd.read_sql(q, engine())
+def _normalize_games(df: pd.DataFrame) -> pd.DataFrame:
+    out = df.reindex(columns=["id"] + GAME_COLS).copy()
+    out["id"] = pd.to_numeric(out["id"], errors="coerce").astype("Int64")
+    out["date"] = pd.to_datetime(out["date"], errors="coerce").dt.date
+    for c in ("white", "black"):
+        out[c] = out[c].astype("string").str.strip()
+    out["result"] = decode_scores(encode_results(out["result"]))   # NaN si non reconnu
+    return out
 
+def diff_games(before: pd.DataFrame, after: pd.DataFrame) -> GameChanges:
+    """Compare l'historique chargé et l'historique édité ; les lignes sans id sont des ajouts.
 
-def save_game_row(date, white, black, result):
+    Lève InvalidResultsError (toutes les lignes fautives de `after`) si un résultat est absent ou non reconnu.
+    """
+    old, new = _normalize_games(before), _normalize_games(after)
+    bad = new["result"].isna() & new[GAME_COLS].notna().any(axis=1)
+    if bad.any():
+        raise InvalidResultsError(pd.Series(after["result"].to_numpy(dtype=object)[bad.to_numpy()], index=np.flatnonzero(bad)))
+    is_new = new["id"].isna()
+    inserted = new.loc[is_new, GAME_COLS].dropna(how="all").reset_index(drop=True)
+
+    kept = new.loc[~is_new]
+    deleted = sorted(set(old["id"].dropna().astype(int)) - set(kept["id"].astype(int)))
+
+    both = kept.merge(old, on="id", how="inner", suffixes=("", "_old"))
+    changed = pd.Series(False, index=both.index)
+    for c in GAME_COLS:
+        a, b = both[c], both[f"{c}_old"]
+        changed |= ~((a == b).fillna(False) | (a.isna() & b.isna()))
+    updated = both.loc[changed, ["id"] + GAME_COLS].reset_index(drop=True)
+
+    touched = pd.concat([
+        inserted["date"],
+        updated["date"],
+        both.loc[changed, "date_old"],
+        old.loc[old["id"].isin(deleted), "date"],
+    ], ignore_index=True).dropna()
+    return GameChanges(inserted, updated, deleted, touched.min() if len(touched) else None)
+
+def _game_params(df: pd.DataFrame) -> list[dict]:
+    rows = df.astype(object).where(df.notna(), None).to_dict("records")
+    for r in rows:
+        r["date"] = None if r["date"] is None else str(r["date"])
+        if "id" in r:
+            r["id"] = int(r["id"])
+    return rows
+
+def apply_game_changes(changes: GameChanges, league: str = DEFAULT_LEAGUE):
+    """Applique le différentiel d'une ligue en une transaction : suppressions, mises à jour puis ajouts (par lots, en pipeline)."""
+    if changes.empty:
+        return
     with engine().begin() as con:
-        con.execute(text("""
-            insert into chessscore.games(date, white, black, result)
-            values (:d, :w, :b, :r)
-        """), {"d": str(date), "w": white, "b": black, "r": float(result)})
+        _has_checkpoint_table(con)
+        with _pipeline(con):
+            if changes.deleted:
+                con.execute(
+                    text("delete from chessscore.games where id in :ids").bindparams(bindparam("ids", expanding=True)),
+                    {"ids": changes.deleted},
+                )
+            if not changes.updated.empty:
+                con.execute(text("""
+                    update chessscore.games
+                    set date = :date, white = :white, black = :black, result = :result
+                    where id = :id
+                """), _game_params(changes.updated))
+            if not changes.inserted.empty:
+                con.execute(text("""
+                    insert into chessscore.games(league, date, white, black, result)
+                    values (:league, :date, :white, :black, :result)
+                    on conflict (league, date, white, black) do update
+                    set result = excluded.result;
+                """), _game_params(changes.inserted.assign(league=league)))
+            if changes.earliest_date is not None:
+                _discard_checkpoints_after_date(con, changes.earliest_date, league, inclusive=True)
+
+def import_games(batches: Iterable[pd.DataFrame], league: str = DEFAULT_LEAGUE) -> int:
+    """Charge des lots normalisés (date, white, black, result) dans `league`, en une seule transaction.
+
+    Postgres : COPY dans une table temporaire puis un seul upsert (le dernier
+    doublon du fichier l'emporte) ; autres moteurs : inserts par lots.
+    Renvoie le nombre de lignes lues dans les lots.
+    """
+    n, earliest = 0, None
+
+    def tracked():
+        nonlocal earliest
+        for batch in batches:
+            if len(batch):
+                first = batch["date"].min()
+                earliest = first if earliest is None else min(earliest, first)
+                yield batch
 
-def save_games_df(df: pd.DataFrame):
     with engine().begin() as con:
-        con.execute(text("truncate table chessscore.games;"))
-        df.to_sql("games", con.connection, if_exists="append", index=False, schema="chessscore")
+        if con.dialect.name == "postgresql":
+            con.execute(text("""
+                create temp table games_import(seq bigint, date date, white text, black text, result real)
+                on commit drop
+            """))
+            with con.connection.driver_connection.cursor() as cur:
+                with cur.copy("copy games_import(seq, date, white, black, result) from stdin with (format csv)") as cp:
+                    for batch in tracked():
+                        batch = batch[GAME_COLS].assign(seq=np.arange(n, n + len(batch)))
+                        cp.write(batch[["seq"] + GAME_COLS].to_csv(index=False, header=False))
+                        n += len(batch)
+            con.execute(text("""
+                insert into chessscore.games(league, date, white, black, result)
+                select distinct on (date, white, black) :league, date, white, black, result
+                from games_import order by date, white, black, seq desc
+                on conflict (league, date, white, black) do update
+                set result = excluded.result
+            """), {"league": league})
+        else:
+            insert = text("""
+                insert into chessscore.games(league, date, white, black, result)
+                values (:league, :date, :white, :black, :result)
+                on conflict (league, date, white, black) do update
+                set result = excluded.result
+            """)
+            for batch in tracked():
+                con.execute(insert, _game_params(batch[GAME_COLS].assign(league=league)))
+                n += len(batch)
+        if earliest is not None:
+            # les checkpoints à partir de la plus ancienne partie importée sont périmés
+            _discard_checkpoints_after_date(con, earliest, league, inclusive=True)
+    # lignes estampillées now() (début de transaction) : un import plus long que WATERMARK_OVERLAP
+    # peut passer sous le filigrane déjà avancé par une autre session -> rechargement complet
+    invalidate_games()
+    return n
+
+# Bilans par joueur agrégés par la base (une ligne par joueur, index couvrants (league, white|black, result))
+PLAYER_STATS_QUERY = """
+    select player, count(*) as games,
+           sum(case when score = 1 then 1 else 0 end) as wins,
+           sum(case when score = 0.5 then 1 else 0 end) as draws,
+           sum(case when score = 0 then 1 else 0 end) as losses
+    from (
+        select trim(white) as player, result as score from chessscore.games where league = :l
+        union all
+        select trim(black) as player, 1 - result as score from chessscore.games where league = :l
+    ) s
+    group by player
+"""
+
+PLAYER_STATS = LRUCache(maxsize=64)
+
+def load_player_stats(league: str, revision) -> pd.DataFrame:
+    """Parties / victoires / nulles / défaites par joueur de `league` ; ne pas modifier en place.
+
+    `revision` = empreinte de la ligue dans le store (cf. core.cache.dataset_fingerprint) :
+    les bilans sont relus quand l'historique de la ligue change.
+    """
+    def read():
+        with perf.span("db.player_stats") as sp:
+            df = pd.read_sql(text(PLAYER_STATS_QUERY), engine(), params={"l": league})
+            sp.rows = len(df)
+        return df.astype({c: "int64" for c in ["games", "wins", "draws", "losses"]})
+    return PLAYER_STATS.get_or_compute((id(engine()), league, revision), read)
 
 # Players (optionnel)
-@st.cache_data(show_spinner=False)
-def load_players(version: int) -> pd.DataFrame:
-    q = "select name, alias from chessscore.players order by name;"
+PLAYERS = LRUCache(maxsize=8)
+
+def _load_all_players(version: int) -> pd.DataFrame:
+    def read():
+        q = "select name, alias, league from chessscore.players order by name;"
+        try:
+            return pd.read_sql(q, engine())
+        except Exception:
+            # table absente : renvoyer DF vide
+            return pd.DataFrame(columns=["name","alias","league"])
+    return PLAYERS.get_or_compute((id(engine()), version), read)
+
+def load_players(version: int, league: str | None = None) -> pd.DataFrame:
+    """Joueurs (name, alias) d'une ligue ; toutes ligues (avec colonne league) si `league` est None."""
+    df = _load_all_players(version)
+    if league is None:
+        return df.copy()
+    return df.loc[df["league"] == league, ["name", "alias"]].reset_index(drop=True)
+
+def save_players_df(df: pd.DataFrame, league: str = DEFAULT_LEAGUE):
+    """Remplace la liste des joueurs de `league` (les autres ligues ne sont pas touchées)."""
+    with engine().begin() as con:
+        con.execute(text("delete from chessscore.players where league = :l"), {"l": league})
+        df[["name", "alias"]].assign(league=league).to_sql("players", con, if_exists="append", index=False, schema="chessscore")
+
+# Checkpoints de classement (cf. core.elo.IncrementalRatings)
+def load_checkpoint_index(params: str, league: str = DEFAULT_LEAGUE) -> dict[int, str]:
+    q = text("select n_games, digest from chessscore.rating_checkpoints where league = :l and params = :p")
     try:
-        return pd.read_sql(q, engine())
+        with engine().connect() as con:
+            return {int(n): d for n, d in con.execute(q, {"l": league, "p": params})}
     except Exception:
-        # table absente : renvoyer DF vide
-        return pd.DataFrame(columns=["name","alias"])
+        # table absente : pas de checkpoint
+        return {}
+
+def load_checkpoint(params: str, n_games: int, league: str = DEFAULT_LEAGUE) -> dict | None:
+    q = text("""
+        select n_games, last_date, digest, state from chessscore.rating_checkpoints
+        where league = :l and params = :p and n_games = :n
+    """)
+    with engine().connect() as con:
+        row = con.execute(q, {"l": league, "p": params, "n": n_games}).mappings().first()
+    return dict(row) if row else None
+
+def save_checkpoints(params: str, records: list[dict], league: str = DEFAULT_LEAGUE):
+    if not records:
+        return
+    with engine().begin() as con:
+        state = "cast(:state as jsonb)" if con.dialect.name == "postgresql" else ":state"   # SQLite : JSON texte
+        con.execute(text(f"""
+            insert into chessscore.rating_checkpoints(league, params, n_games, last_date, digest, state)
+            values (:league, :params, :n_games, :last_date, :digest, {state})
+            on conflict (league, params, n_games) do update
+            set last_date = excluded.last_date, digest = excluded.digest,
+                state = excluded.state, created_at = current_timestamp;
+        """), [{"league": league, "params": params, **r} for r in records])
 
-def save_players_df(df: pd.DataFrame):
+def discard_checkpoints_after(params: str, n_games: int, league: str = DEFAULT_LEAGUE):
     with engine().begin() as con:
-        con.execute(text("truncate table chessscore.players;"))
-        df.to_sql("players", con.connection, if_exists="append", index=False, schema="chessscore")
+        con.execute(text("delete from chessscore.rating_checkpoints where league = :l and params = :p and n_games > :n"),
+                    {"l": league, "p": params, "n": n_games})
+
+def checkpoint_store(league: str = DEFAULT_LEAGUE) -> CheckpointStore:
+    """Checkpoints persistants d'une ligue, pour core.elo.IncrementalRatings."""
+    return CheckpointStore(
+        index=lambda p: load_checkpoint_index(p, league),
+        load=lambda p, n: load_checkpoint(p, n, league),
+        save=lambda p, records: save_checkpoints(p, records, league),
+        discard_after=lambda p, n: discard_checkpoints_after(p, n, league),
+    )
+
+_checkpoint_table: dict[int, bool] = {}   # id(moteur) -> table rating_checkpoints présente
+
+def _has_checkpoint_table(con) -> bool:
+    """Testé une fois par moteur (schémas antérieurs sans checkpoints) : pas de savepoint par écriture."""
+    key = id(con.engine)
+    if key not in _checkpoint_table:
+        if con.dialect.name == "postgresql":
+            found = con.execute(text("select to_regclass('chessscore.rating_checkpoints') is not null")).scalar()
+        else:
+            try:
+                with con.begin_nested():
+                    con.execute(text("select 1 from chessscore.rating_checkpoints limit 1"))
+                found = True
+            except Exception:
+                found = False
+        _checkpoint_table[key] = bool(found)
+    return _checkpoint_table[key]
+
+def _discard_checkpoints_after_date(con, date, league: str, inclusive: bool = False):
+    if not _has_checkpoint_table(con):
+        return
+    op = ">=" if inclusive else ">"
+    con.execute(text(f"delete from chessscore.rating_checkpoints where league = :l and last_date {op} :d"),
+                {"l": league, "d": str(date)})
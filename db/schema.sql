@@ -10,13 +10,74 @@ create table if not exists games(
   result real not null check (result in (0, 0.5, 1))
 );
 
+-- Chargement différentiel (db.repo.GamesStore) : horodatage des modifications + trace des suppressions
+alter table games add column if not exists updated_at timestamptz not null default now();
+
+-- Ligues / équipes : partitions indépendantes (classement, checkpoints) ; 'default' pour l'historique existant
+alter table games add column if not exists league text not null default 'default';
+
+create table if not exists games_tombstones(
+  id bigint primary key,
+  deleted_at timestamptz not null default now()
+);
+
+create or replace function games_touch() returns trigger language plpgsql as $$
+begin
+  new.updated_at := now();
+  return new;
+end $$;
+
+create or replace function games_tombstone() returns trigger language plpgsql as $$
+begin
+  insert into chessscore.games_tombstones(id) values (old.id)
+  on conflict (id) do update set deleted_at = excluded.deleted_at;
+  return old;
+end $$;
+
+drop trigger if exists games_touch_trg on games;
+create trigger games_touch_trg before update on games
+  for each row execute function games_touch();
+
+drop trigger if exists games_tombstone_trg on games;
+create trigger games_tombstone_trg after delete on games
+  for each row execute function games_tombstone();
+
 create table if not exists players(
   id bigserial primary key,
   name text unique not null,
   alias text
 );
 
+alter table players add column if not exists league text not null default 'default';
+alter table players drop constraint if exists players_name_key;   -- un nom est unique par ligue
+create unique index if not exists players_league_name on players(league, name);
+
 create index if not exists games_date_idx  on games(date);
 create index if not exists games_white_idx on games(white);
 create index if not exists games_black_idx on games(black);
-create unique index if not exists games_uniq_triplet on games(date, white, black);
+drop index if exists games_uniq_triplet;
+create unique index if not exists games_uniq_league on games(league, date, white, black);
+-- bilans par joueur (db.repo.load_player_stats) : parcours d'index seul
+create index if not exists games_league_white_idx on games(league, white, result);
+create index if not exists games_league_black_idx on games(league, black, result);
+-- pages de l'historique (db.repo.load_games_page) : pagination keyset sur (date, id)
+create index if not exists games_league_date_id_idx on games(league, date desc, id desc);
+create index if not exists games_updated_at_idx on games(updated_at);
+create index if not exists games_tombstones_deleted_at_idx on games_tombstones(deleted_at);
+
+-- Photos de l'état du classement toutes les N parties, par jeu de paramètres ELO
+-- (params = "start_rating|base_k|newbie_games|newbie_k", digest = empreinte chaînée du préfixe rejoué)
+create table if not exists rating_checkpoints(
+  params text not null,
+  n_games integer not null check (n_games > 0),
+  last_date date not null,
+  digest text not null,
+  state jsonb not null,
+  created_at timestamptz not null default now(),
+  primary key (params, n_games)
+);
+
+alter table rating_checkpoints add column if not exists league text not null default 'default';
+alter table rating_checkpoints drop constraint if exists rating_checkpoints_pkey;
+create unique index if not exists rating_checkpoints_league_key on rating_checkpoints(league, params, n_games);
+create index if not exists rating_checkpoints_date_idx on rating_checkpoints(last_date);
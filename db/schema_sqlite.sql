@@ -0,0 +1,62 @@
+-- Schéma Chessscore pour SQLite embarqué (db.backends) : mêmes tables, index et déclencheurs que db/schema.sql.
+-- Le fichier est attaché sous le nom `chessscore` : les requêtes qualifiées (chessscore.games, ...) sont identiques.
+
+create table if not exists chessscore.games(
+  id integer primary key autoincrement,
+  league text not null default 'default',   -- ligue / équipe : partition indépendante
+  date date not null,
+  white text not null check (length(trim(white)) > 0),
+  black text not null check (length(trim(black)) > 0),
+  result real not null check (result in (0, 0.5, 1)),
+  -- Chargement différentiel (db.repo.GamesStore) : horodatage des modifications + trace des suppressions
+  updated_at timestamp not null default current_timestamp
+);
+
+create table if not exists chessscore.games_tombstones(
+  id integer primary key,
+  deleted_at timestamp not null default current_timestamp
+);
+
+create trigger if not exists chessscore.games_touch_trg after update on games
+  for each row when new.updated_at = old.updated_at
+begin
+  update games set updated_at = current_timestamp where id = new.id;
+end;
+
+create trigger if not exists chessscore.games_tombstone_trg after delete on games
+  for each row
+begin
+  insert or replace into games_tombstones(id, deleted_at) values (old.id, current_timestamp);
+end;
+
+create table if not exists chessscore.players(
+  id integer primary key autoincrement,
+  league text not null default 'default',
+  name text not null,
+  alias text
+);
+
+create index if not exists chessscore.games_date_idx  on games(date);
+create index if not exists chessscore.games_white_idx on games(white);
+create index if not exists chessscore.games_black_idx on games(black);
+create unique index if not exists chessscore.games_uniq_league on games(league, date, white, black);
+create unique index if not exists chessscore.players_league_name on players(league, name);
+create index if not exists chessscore.games_league_white_idx on games(league, white, result);
+create index if not exists chessscore.games_league_black_idx on games(league, black, result);
+create index if not exists chessscore.games_league_date_id_idx on games(league, date desc, id desc);
+create index if not exists chessscore.games_updated_at_idx on games(updated_at);
+create index if not exists chessscore.games_tombstones_deleted_at_idx on games_tombstones(deleted_at);
+
+-- Photos de l'état du classement toutes les N parties, par jeu de paramètres ELO (state = JSON texte)
+create table if not exists chessscore.rating_checkpoints(
+  league text not null default 'default',
+  params text not null,
+  n_games integer not null check (n_games > 0),
+  last_date date not null,
+  digest text not null,
+  state text not null,
+  created_at timestamp not null default current_timestamp,
+  primary key (league, params, n_games)
+);
+
+create index if not exists chessscore.rating_checkpoints_date_idx on rating_checkpoints(last_date);
@@ -0,0 +1,95 @@
+# Parité des moteurs Élo : référence (boucle) = tableaux = incrémental (ajout, reprise, édition, suppression),
+# classement à date et balayage de paramètres, sur une ligue synthétique déterministe.
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from bench.league import generate_league
+from core.elo import CheckpointStore, IncrementalRatings, compute_ratings, leaderboard_as_of
+from core.sweep import param_grid, sweep_ratings
+
+PARAMS = (1200, 20, 10, 40)
+
+@pytest.fixture(scope="module")
+def games() -> pd.DataFrame:
+    return generate_league(3_000, n_players=40, days=120, seed=1)
+
+def memory_store() -> CheckpointStore:
+    """Checkpoints en mémoire, même contrat que db.repo.checkpoint_store."""
+    data: dict[str, dict[int, dict]] = {}
+    return CheckpointStore(
+        index=lambda p: {n: r["digest"] for n, r in data.get(p, {}).items()},
+        load=lambda p, n: data.get(p, {}).get(n),
+        save=lambda p, records: data.setdefault(p, {}).update({r["n_games"]: r for r in records}),
+        discard_after=lambda p, n: data.__setitem__(p, {k: r for k, r in data.get(p, {}).items() if k <= n}),
+    )
+
+def reference(games: pd.DataFrame, params=PARAMS) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return compute_ratings(games, *params, engine="loop")
+
+def assert_same(actual: tuple[pd.DataFrame, pd.DataFrame], expected: tuple[pd.DataFrame, pd.DataFrame]):
+    assert_frame_equal(actual[0], expected[0])
+    assert_frame_equal(actual[1], expected[1])
+
+def test_array_matches_loop(games):
+    assert_same(compute_ratings(games, *PARAMS, engine="array"), reference(games))
+
+def test_incremental_append(games):
+    engine = IncrementalRatings()
+    engine.compute(games.iloc[:2_000], *PARAMS)
+    result = engine.compute(games, *PARAMS)
+    assert engine.last_mode == "append"
+    assert_same(result, reference(games))
+
+def test_incremental_edit_and_delete(games):
+    engine = IncrementalRatings(memory_store())
+    engine.compute(games, *PARAMS)
+
+    edited = games.copy()
+    edited.loc[1_500, "result"] = 1.0 - edited.loc[1_500, "result"]
+    assert_same(engine.compute(edited, *PARAMS), reference(edited))
+
+    deleted = edited.drop(index=[700, 2_200]).reset_index(drop=True)
+    assert_same(engine.compute(deleted, *PARAMS), reference(deleted))
+
+def test_resume_from_stored_checkpoints(games):
+    store = memory_store()
+    IncrementalRatings(store).compute(games.iloc[:2_500], *PARAMS)
+
+    # nouvelle session : seul le stockage persistant est partagé
+    engine = IncrementalRatings(store)
+    assert_frame_equal(engine.leaderboard(games, *PARAMS), reference(games)[0])
+    assert engine.last_mode == "resume"
+    assert_same(IncrementalRatings(store).compute(games, *PARAMS), reference(games))
+
+def test_leaderboard_as_of(games):
+    history = IncrementalRatings().history(games, *PARAMS)
+    for date in ["2024-01-15", "2024-03-01", "2024-04-29"]:
+        played = games[pd.to_datetime(games["date"]) <= pd.Timestamp(date)]
+        assert_frame_equal(leaderboard_as_of(history, date), reference(played)[0])
+
+def test_sweep_matches_replay(games):
+    grid = param_grid([1200, 1500], [16, 32], [10], [40])
+    _, tables = sweep_ratings(games, grid)
+    for params, table in zip(grid, tables):
+        assert_frame_equal(table, reference(games, tuple(params.values()))[0])
+
+def flipped(games: pd.DataFrame, row: int) -> pd.DataFrame:
+    out = games.copy()
+    out.loc[row, "result"] = 1.0 - out.loc[row, "result"]
+    return out
+
+def test_resume_ignores_checkpoints_overwritten_by_another_session(games):
+    store = memory_store()
+    IncrementalRatings(store).compute(games, *PARAMS)
+
+    # cette session reprend du dernier checkpoint et garde l'index lu (celui de `games`)
+    engine = IncrementalRatings(store)
+    engine.leaderboard(games, *PARAMS)
+
+    # une autre session réécrit les checkpoints à partir de 1000 avec un autre historique
+    IncrementalRatings(store).compute(flipped(games, 1_000), *PARAMS)
+
+    changed = flipped(games, 2_600)
+    assert_frame_equal(engine.leaderboard(changed, *PARAMS), reference(changed)[0])
+
@@ -1,32 +1,80 @@
+import html
+
 import streamlit as st
 import pandas as pd
 
+from core import perf
+from core.cache import LRUCache
+
+TOP_N = 10          # joueurs affichés d'office dans la sidebar
+PAGE_SIZE = 25      # joueurs par page dans la liste complète
+
+# HTML déjà construit, par (contenu du classement, tranche, recherche)
+_HTML = LRUCache(maxsize=32)
+
 def chess_icon(rank: int) -> str:
     return {1:"♔",2:"♕",3:"♖",4:"♗",5:"♘"}.get(rank,"♙")
 
-def render_sidebar_leaderboard(df: pd.DataFrame) -> None:
+def _row_html(rank: int, player: str, rating: float) -> str:
+    size = "1.6rem" if rank==1 else ("1.4rem" if rank==2 else ("1.2rem" if rank==3 else "1.0rem"))
+    weight = "900" if rank==1 else ("800" if rank==2 else ("700" if rank==3 else "600"))
+    bg = ("background:rgba(255,215,0,0.25);" if rank==1 else
+          "background:rgba(192,192,192,0.25);" if rank==2 else
+          "background:rgba(205,127,50,0.25);" if rank==3 else "")
+    label = "🥇" if rank==1 else ("🥈" if rank==2 else ("🥉" if rank==3 else f"{rank}."))
+    return (
+        f"<div style='display:flex;align-items:center;justify-content:space-between;padding:4px 6px;{bg}"
+        f"border-radius:6px;border-bottom:1px solid rgba(128,128,128,0.25);margin:2px 0;'>"
+        f"<div style='flex:1;display:flex;align-items:center;gap:0.5rem;font-size:{size};font-weight:{weight};'>"
+        f"<span>{label}</span><span>{chess_icon(rank)}</span><span>{html.escape(str(player))}</span></div>"
+        f"<div style='font-size:{size};font-weight:{weight};font-variant-numeric:tabular-nums;'>{int(round(rating))}</div>"
+        f"</div>"
+    )
+
+def _ranked(df: pd.DataFrame) -> pd.DataFrame:
+    top = df[["player","rating"]].sort_values("rating", ascending=False, kind="stable").reset_index(drop=True)
+    return top.assign(rank=top.index + 1)
+
+def _table_key(df: pd.DataFrame) -> tuple:
+    return len(df), int(pd.util.hash_pandas_object(df[["player","rating"]], index=False).sum())
+
+def leaderboard_html(df: pd.DataFrame, start: int = 0, stop: int | None = None, query: str = "") -> tuple[str, int]:
+    """Un seul bloc HTML pour les joueurs [start, stop) (après filtre `query`) ; renvoie (html, nb de joueurs filtrés).
+
+    Mémoïsé sur le contenu du classement : rien n'est reconstruit tant que les classements ne changent pas.
+    """
+    query = query.strip().lower()
+
+    def build():
+        top = _ranked(df)
+        if query:
+            top = top[top["player"].astype(str).str.contains(query, case=False, regex=False)]
+        rows = top.iloc[start:stop]
+        body = "".join(_row_html(r, p, v) for p, v, r in zip(rows["player"], rows["rating"], rows["rank"]))
+        return f"<div>{body}</div>", len(top)
+    return _HTML.get_or_compute((_table_key(df), start, stop, query), build)
+
+def render_sidebar_leaderboard(df: pd.DataFrame, top_n: int = TOP_N) -> None:
+    with perf.span("ui.sidebar_leaderboard", rows=len(df)):
+        _render_sidebar_leaderboard(df, top_n)
+
+def _render_sidebar_leaderboard(df: pd.DataFrame, top_n: int) -> None:
     st.header("Classement (ELO)")
     if df.empty:
         st.caption("Aucun joueur"); return
-    top = df[["player","rating"]].sort_values("rating", ascending=False).reset_index(drop=True)
-    for i, row in top.iterrows():
-        rank = i+1
-        icon = chess_icon(rank)
-        size = "1.6rem" if rank==1 else ("1.4rem" if rank==2 else ("1.2rem" if rank==3 else "1.0rem"))
-        weight = "900" if rank==1 else ("800" if rank==2 else ("700" if rank==3 else "600"))
-        bg = ("background:rgba(255,215,0,0.25);" if rank==1 else
-              "background:rgba(192,192,192,0.25);" if rank==2 else
-              "background:rgba(205,127,50,0.25);" if rank==3 else "")
-        label = "🥇" if rank==1 else ("🥈" if rank==2 else ("🥉" if rank==3 else f"{rank}."))
-        html = f"""
-        <div style='display:flex;align-items:center;justify-content:space-between;padding:4px 6px;{bg}border-radius:6px;'>
-            <div style='flex:1;display:flex;align-items:center;gap:0.5rem;font-size:{size};font-weight:{weight};'>
-                <span>{label}</span><span>{icon}</span><span>{row['player']}</span>
-            </div>
-            <div style='font-size:{size};font-weight:{weight};font-variant-numeric:tabular-nums;'>
-                {int(round(row['rating']))}
-            </div>
-        </div>"""
-        st.markdown(html, unsafe_allow_html=True)
-        if i < len(top)-1:
-            st.markdown("<hr style='margin:2px 0; opacity:0.25'>", unsafe_allow_html=True)
+    body, _ = leaderboard_html(df, 0, top_n)
+    st.markdown(body, unsafe_allow_html=True)
+    if len(df) > top_n and st.toggle(f"Tous les joueurs ({len(df)})", key="sidebar_lb_all"):
+        _render_leaderboard_pages(df)
+
+def _render_leaderboard_pages(df: pd.DataFrame) -> None:
+    """Liste complète à la demande : recherche par nom + pagination, une page = un bloc HTML."""
+    query = st.text_input("Rechercher un joueur", key="sidebar_lb_query").strip()
+    _, total = leaderboard_html(df, 0, 0, query)
+    if total == 0:
+        st.caption("Aucun joueur trouvé"); return
+    pages = (total - 1) // PAGE_SIZE + 1
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"sidebar_lb_page:{query}") if pages > 1 else 1
+    body, _ = leaderboard_html(df, (page - 1) * PAGE_SIZE, page * PAGE_SIZE, query)
+    st.markdown(body, unsafe_allow_html=True)
+    st.caption(f"Page {page}/{pages} · {total} joueur(s)")
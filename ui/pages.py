@@ -1,16 +1,128 @@
+import functools
+import io
 from datetime import datetime
-from io import BytesIO
 
 import numpy as np
 import pandas as pd
 import streamlit as st
-
-from db.repo import load_games, save_games_df, save_game_row, load_players, save_players_df
-from core.elo import compute_ratings
+from streamlit.errors import StreamlitAPIException
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from db.repo import (
+    load_games, save_game_row, load_players, import_games, save_players_df, diff_games, apply_game_changes, invalidate_games,
+    checkpoint_store, load_leagues, load_league_games, load_player_stats, load_games_page, HISTORY_PAGE_ROWS,
+)
+from core import perf
+from core.cache import RATINGS, dataset_fingerprint
+from core.elo import IncrementalRatings, leaderboard_as_of
+from core.export import EXPORTS, FORMATS, SHEETS
+from core.glicko import GLICKO_DEFAULTS, PERIODS
+from core.history import RatingHistory
+from core.importer import ImportReport, read_batches, validated
+from core.leagues import DEFAULT_LEAGUE, league_summary, league_tables
+from core.ratings import SYSTEMS, as_of_cutoff, rate, rating_history, system_key, system_of, with_stats
+from core.results import InvalidResultsError, to_emojis
+from core.sweep import PARAM_NAMES, param_grid, sweep_ratings
+from ui.components import TOP_N, render_sidebar_leaderboard
+
+def current_league() -> str:
+    return st.session_state.get("league", DEFAULT_LEAGUE)
+
+def _rating_engine(league: str) -> IncrementalRatings:
+    """Un moteur incrémental par ligue : changer de ligue ne jette pas l'état des autres."""
+    engines = st.session_state.setdefault("rating_engines", {})
+    if league not in engines:
+        engines[league] = IncrementalRatings(checkpoint_store(league))
+    return engines[league]
+
+def _params_tuple(params: dict) -> tuple:
+    return params["start_rating"], params["base_k"], params["newbie_games"], params["newbie_k"]
+
+# `games_df` = parties d'une seule ligue : son empreinte ne change pas quand une autre ligue est modifiée.
+# Élo : moteur incrémental (checkpoints) ; autres systèmes : rejeu vectorisé mis en cache (core.ratings).
+def ratings_for_ui(games_df: pd.DataFrame, params: dict, league: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Classement + détail : cache partagé entre sessions, sinon moteur incrémental de la session."""
+    if system_of(params) != "elo":
+        return rate(games_df, params)
+    key = ("ui", dataset_fingerprint(games_df), _params_tuple(params))
+    return RATINGS.get_or_compute(key, lambda: _rating_engine(league).compute(games_df, *_params_tuple(params)))
+
+def leaderboard_for_ui(games_df: pd.DataFrame, params: dict, league: str) -> pd.DataFrame:
+    """Classement seul (sidebar) : pas besoin du détail par partie."""
+    if system_of(params) != "elo":
+        return rate(games_df, params)[0]
+    key = ("ui-table", dataset_fingerprint(games_df), _params_tuple(params))
+    return RATINGS.get_or_compute(key, lambda: _rating_engine(league).leaderboard(games_df, *_params_tuple(params)))
+
+def history_for_ui(games_df: pd.DataFrame, params: dict, league: str) -> RatingHistory:
+    """Séries Élo par joueur (graphiques du Classement), partagées comme le classement."""
+    if system_of(params) != "elo":
+        return rating_history(games_df, params)
+    key = ("ui-history", dataset_fingerprint(games_df), _params_tuple(params))
+    return RATINGS.get_or_compute(key, lambda: _rating_engine(league).history(games_df, *_params_tuple(params)))
+
+NEW_LEAGUE = "<nouvelle>"
+
+def _create_league():
+    name = st.session_state.get("league_new", "").strip()
+    if name:
+        st.session_state.league = st.session_state.league_select = name
+        st.session_state.league_new = ""
+
+def render_league_selector():
+    """Ligue courante (st.session_state.league) : toutes les pages et la sidebar s'y limitent."""
+    league = current_league()
+    leagues = sorted(set(load_leagues(st.session_state.get("data_version", 0))) | {league})
+    st.session_state.setdefault("league_select", league)
+    choice = st.selectbox("Ligue", leagues + [NEW_LEAGUE], key="league_select")
+    if choice == NEW_LEAGUE:
+        # la ligue existe dès sa première partie ou son premier joueur
+        st.text_input("Nom de la nouvelle ligue", key="league_new", on_change=_create_league)
+    else:
+        st.session_state.league = choice
+
+def _sidebar_stamp() -> tuple[tuple, pd.DataFrame]:
+    """(empreinte des parties de la ligue, système + paramètres, ligue) : ce dont dépend le classement de la sidebar."""
+    params, league = st.session_state.elo_params, current_league()
+    games = load_games(st.session_state.get("data_version", 0), league)
+    return (dataset_fingerprint(games), system_key(params), league), games
+
+SIDEBAR_FRAGMENT = "sidebar_leaderboard"
+
+def _timed_fragment(name: str):
+    """Span du fragment ; relancé seul, il n'exécute pas app.py et ouvre donc son propre rerun perf."""
+    def wrap(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            ctx = get_script_run_ctx()
+            rerun = perf.begin_rerun(f"fragment.{name}") if ctx is not None and ctx.fragment_ids_this_run else None
+            try:
+                with perf.span(f"fragment.{name}"):
+                    return func(*args, **kwargs)
+            finally:
+                perf.finish_rerun(rerun)
+        return run
+    return wrap
+
+@st.fragment(key=SIDEBAR_FRAGMENT)
+@_timed_fragment("sidebar")
+def render_sidebar_fragment():
+    """Classement de la sidebar ; recalculé seulement quand les parties de la ligue, les paramètres ou la ligue changent.
+
+    Pas de rafraîchissement périodique : les boutons qui enregistrent des parties relancent ce fragment
+    avec le leur (cf. _rerun_with_sidebar) ; les écritures des autres sessions apparaissent au rerun suivant.
+    """
+    params, league = st.session_state.elo_params, current_league()
+    stamp, games = _sidebar_stamp()
+    cached = st.session_state.get("_sidebar_ratings")
+    if cached is None or cached[0] != stamp:
+        cached = st.session_state._sidebar_ratings = (stamp, leaderboard_for_ui(games, params, league))
+    render_sidebar_leaderboard(cached[1], st.session_state.get("sidebar_top_n", TOP_N))
 
 def _existing_players() -> list[str]:
-    games_df = load_games()
-    players_df = load_players()
+    version = st.session_state.get("data_version", 0)
+    games_df = load_games(version, current_league())
+    players_df = load_players(version, current_league())
     combined = pd.concat([
         games_df["white"], games_df["black"], players_df.get("name", pd.Series(dtype=str))
     ], ignore_index=True).dropna()
@@ -20,8 +132,42 @@ def render_tab_saisie_histo(params: dict):
     if "data_version" not in st.session_state:
         st.session_state.data_version = 0
 
-    games_df = load_games(st.session_state.data_version)
-    players_df = load_players(st.session_state.data_version)
+    # fragments indépendants : une saisie ne relance que son propre bloc
+    _render_entry_forms()
+    _render_history_editor()
+
+def _rerun_with_sidebar(fragment: str):
+    """Callback d'un bouton qui enregistre des parties : relance son fragment puis celui de la sidebar, pas la page.
+
+    Le fragment écrit d'abord ; la sidebar, relancée ensuite, ne recalcule que si son empreinte a changé.
+    """
+    try:
+        st.rerun([fragment, SIDEBAR_FRAGMENT])
+    except StreamlitAPIException:
+        pass   # sidebar pas (encore) rendue : rerun par défaut du seul fragment
+
+def _notify_write(flash_key: str, message: str):
+    """Après une écriture : invalide les caches, mémorise le message et relance le fragment courant
+    (suivi de la sidebar si le bouton l'a demandé, cf. _rerun_with_sidebar)."""
+    st.session_state.data_version += 1
+    st.session_state[flash_key] = message
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()   # hors rerun de fragment (ex. soumission traitée pendant un rerun complet)
+
+def _show_flash(flash_key: str):
+    message = st.session_state.pop(flash_key, None)
+    if message:
+        st.success(message)
+
+@st.fragment(key="entry_forms")
+@_timed_fragment("entry_forms")
+def _render_entry_forms():
+    league = current_league()
+    games_df = load_games(st.session_state.data_version, league)
+    players_df = load_players(st.session_state.data_version, league)
+    _show_flash("flash_entry")
 
     # --- Ajout d'un joueur (un seul bouton) ---
     st.session_state.setdefault("show_add_player", False)
@@ -41,19 +187,19 @@ def render_tab_saisie_histo(params: dict):
                 cancel_add_player = st.form_submit_button("Annuler")
 
         # Annuler -> referme le panneau, rien d'autre
-        if 'cancel_add_player' in locals() and cancel_add_player:
+        if cancel_add_player:
             st.session_state.show_add_player = False
-            st.stop()
+            st.rerun(scope="fragment")
 
         # Valider -> validations + insertion + refresh
-        if 'submitted_add_player' in locals() and submitted_add_player:
+        if submitted_add_player:
             name = (new_player or "").strip()
             errors = []
             if len(name) < 2:
                 errors.append("Nom trop court (2 caractères minimum).")
 
             # Unicité (casse comprise -> comparaison EXACTE)
-            dfp = load_players()
+            dfp = players_df
             if "name" in dfp.columns and name in set(dfp["name"].astype(str)):
                 errors.append(f"Le joueur « {name} » existe déjà.")
 
@@ -64,13 +210,11 @@ def render_tab_saisie_histo(params: dict):
                 if "name" not in dfp.columns:
                     dfp = pd.DataFrame(columns=["name", "alias"])
                 dfp = pd.concat([dfp, pd.DataFrame([{"name": name, "alias": None}])], ignore_index=True)
-                save_players_df(dfp)
-                st.success(f"Joueur « {name} » ajouté.")
+                save_players_df(dfp, league)
 
-                # Fermer le panneau + invalider caches + recharger l'UI
+                # Fermer le panneau + invalider caches + recharger le fragment
                 st.session_state.show_add_player = False
-                st.session_state.data_version += 1
-                st.rerun()
+                _notify_write("flash_entry", f"Joueur « {name} » ajouté.")
 
     # -------- Formulaire d'ajout : rerun uniquement au submit --------
     with st.form("form_add_game", clear_on_submit=True):
@@ -79,7 +223,6 @@ def render_tab_saisie_histo(params: dict):
         c1, c2, c3 = st.columns(3)
 
         # options joueurs existants (à partir des données cachées)
-        players_df = load_players()
         combined = pd.concat([
             games_df["white"], games_df["black"], players_df.get("name", pd.Series(dtype=str))
         ], ignore_index=True).dropna()
@@ -100,17 +243,68 @@ def render_tab_saisie_histo(params: dict):
         result_val = res_map[res_label]
 
         valid = white and black and white != black
-        submitted_add = st.form_submit_button("Enregistrer la partie", type="primary", disabled=not valid)
+        submitted_add = st.form_submit_button("Enregistrer la partie", type="primary", disabled=not valid,
+                                              on_click=_rerun_with_sidebar, args=("entry_forms",))
 
     if submitted_add:
-        save_game_row(date_val, white.strip(), black.strip(), result_val)
-        st.success("Partie ajoutée.")
-        st.session_state.data_version += 1   # invalide le cache
-        st.rerun()
+        save_game_row(date_val, white.strip(), black.strip(), result_val, league)
+        _notify_write("flash_entry", "Partie ajoutée.")
+
+ALL_PLAYERS = "(tous)"
+
+def _history_prev():
+    if len(st.session_state.history_cursors) > 1:
+        st.session_state.history_cursors.pop()
+
+def _history_next():
+    if st.session_state.get("history_next") is not None:
+        st.session_state.history_cursors.append(st.session_state.history_next)
+
+@st.fragment(key="history_editor")
+@_timed_fragment("history_editor")
+def _render_history_editor():
+    league = current_league()
 
     # -------- Historique (édition) --------
-    st.subheader("Historique des parties")
-    st.caption("Astuce: corrigez une ligne puis cliquez « Sauvegarder ».")
+    c_title, c_refresh = st.columns([4, 1])
+    with c_title:
+        st.subheader("Historique des parties")
+    with c_refresh:
+        # relance ce seul fragment (parties ajoutées depuis le formulaire au-dessus)
+        st.button("🔄 Actualiser", key="btn_refresh_history")
+    _show_flash("flash_history")
+
+    # filtres appliqués par la base ; un changement de filtre ou de ligue revient à la première page
+    c_player, c_range = st.columns(2)
+    with c_player:
+        # joueurs ayant des parties : bilans agrégés par la base (O(joueurs), en cache par révision de la ligue)
+        fp = dataset_fingerprint(load_games(st.session_state.data_version, league))
+        players = sorted(load_player_stats(league, fp)["player"])
+        player = st.selectbox("Joueur", [ALL_PLAYERS] + players, key="history_player")
+    with c_range:
+        period = st.date_input("Période", value=[], key="history_range", format="DD/MM/YYYY")
+    start = period[0] if len(period) > 0 else None
+    end = period[1] if len(period) > 1 else None
+    player = None if player == ALL_PLAYERS else player
+    filters = (league, player, start, end)
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_cursors = [None]   # curseur (date, id) du début de chaque page vue
+
+    cursor = st.session_state.history_cursors[-1]
+    games_df, st.session_state.history_next = load_games_page(league, cursor, player=player, start=start, end=end)
+    page = len(st.session_state.history_cursors)
+
+    c_prev, c_page, c_next = st.columns([1, 2, 1])
+    with c_prev:
+        st.button("◀ Précédent", key="btn_history_prev", on_click=_history_prev, disabled=page == 1)
+    with c_page:
+        st.caption(f"Page {page} · {len(games_df)} partie(s), {HISTORY_PAGE_ROWS} par page")
+    with c_next:
+        st.button("Suivant ▶", key="btn_history_next", on_click=_history_next,
+                  disabled=st.session_state.history_next is None)
+
+    st.caption("Astuce: corrigez une ligne puis cliquez « Sauvegarder » (seule la page affichée est enregistrée).")
     st.markdown(
         "<small><b>Légende résultat :</b> ⚪ = Blancs (1) · ⚫ = Noirs (0) · 🤝 = Nulle (0.5)</small>",
         unsafe_allow_html=True,
@@ -118,18 +312,11 @@ def render_tab_saisie_histo(params: dict):
 
     display_df = games_df.copy()
 
-    # masquer id côté UI (si présent)
+    # id masqué côté UI, gardé pour le différentiel
     column_order = ["date", "white", "black", "result"]
-    if "id" in display_df.columns:
-        # on garde 'id' pour la sauvegarde complète si tu veux, mais on ne l'affiche pas
-        pass
 
-    # mapping chiffres -> emojis pour l'affichage
-    def _to_num_or_keep(x):
-        try: return float(x)
-        except Exception: return x
-    display_df["result"] = display_df["result"].apply(_to_num_or_keep)
-    display_df["result"] = display_df["result"].map({1.0:"⚪", 0.0:"⚫", 0.5:"🤝"}).fillna(display_df["result"])
+    # codes résultat -> emojis pour l'affichage (valeur d'origine gardée si non reconnue)
+    display_df["result"] = to_emojis(display_df["result"])
 
     with st.form("form_save_history"):
         edit_df = st.data_editor(
@@ -143,106 +330,291 @@ def render_tab_saisie_histo(params: dict):
                 "black": st.column_config.TextColumn("black"),
                 "result":st.column_config.TextColumn("result", help="⚪=Blancs, ⚫=Noirs, 🤝=Nulle (1/0/0.5 acceptés)"),
             },
-            key="editor_games",
+            # une clé par page affichée : les modifications en cours ne passent pas d'une page à l'autre
+            key=f"editor_games_{st.session_state.data_version}_{page}_{hash((filters, cursor))}",
         )
-        submitted_hist = st.form_submit_button("Sauvegarder l'historique")
+        submitted_hist = st.form_submit_button("Sauvegarder l'historique", on_click=_rerun_with_sidebar,
+                                               args=("history_editor",))
 
     if submitted_hist:
         df_save = edit_df.copy()
 
-        # conversion inverse emojis/texte vers 1.0 / 0.0 / 0.5
-        def convert_result(val):
-            if pd.isna(val): return np.nan
-            s = str(val).strip().lower()
-            if s in {"⚪","⚪️","white","w","1-0","1","1.0"}: return 1.0
-            if s in {"⚫","⚫️","black","b","0-1","0","0.0"}: return 0.0
-            if s in {"🤝","draw","d","nulle","1/2-1/2","0.5-0.5","0.5","0,5"}: return 0.5
-            try:
-                f = float(s.replace(",", "."))
-                if f in (0.0, 0.5, 1.0): return f
-            except Exception: pass
-            return s
-
-        df_save["result"] = df_save["result"].apply(convert_result)
         df_save["date"] = pd.to_datetime(df_save["date"], errors="coerce").dt.date
 
-        # réécrit tout l'historique (comme avant)
-        save_games_df(df_save)
-        st.success("Sauvegardé.")
-        st.session_state.data_version += 1   # invalide le cache
-        st.rerun()
+        # n'écrit que le différentiel de la page (ajouts / modifications / suppressions, par id) ;
+        # les résultats sont décodés en 1.0 / 0.5 / 0.0 par le codec commun
+        try:
+            changes = diff_games(games_df, df_save)
+        except InvalidResultsError as e:
+            rows = ", ".join(f"ligne {i + 1} ({v!r})" for i, v in e.rows.head(20).items())
+            rows += " …" if len(e.rows) > 20 else ""
+            st.error(f"Résultat invalide pour {len(e.rows)} ligne(s) : {rows}. Rien n'a été sauvegardé.")
+            return
+        apply_game_changes(changes, league)
+        _notify_write("flash_history", f"Sauvegardé ({len(changes.inserted)} ajout(s), {len(changes.updated)} "
+                                       f"modification(s), {len(changes.deleted)} suppression(s)).")
 
 
 def render_tab_classement(params: dict):
-    games_df = load_games()
-    ratings, games_enriched = compute_ratings(
-        games_df,
-        start_rating=params["start_rating"],
-        base_k=params["base_k"],
-        newbie_games=params["newbie_games"],
-        newbie_k=params["newbie_k"],
-    )
-    st.subheader("Classement actuel")
-    st.dataframe(ratings, use_container_width=True)
+    league = current_league()
+    games_df = load_games(st.session_state.get("data_version", 0), league)
+    ratings, games_enriched = ratings_for_ui(games_df, params, league)
+    c_title, c_date = st.columns([3, 1])
+    with c_date:
+        # classement à une date passée : lu dans les séries Élo, sans rejeu
+        as_of = st.date_input("Classement au", value=None, key="classement_as_of", help="Vide = classement actuel")
+    with c_title:
+        st.subheader(f"Classement au {as_of:%d/%m/%Y}" if as_of else "Classement actuel")
+    if as_of and not ratings.empty:
+        cutoff = as_of_cutoff(params, as_of)
+        if cutoff.date() != as_of:
+            st.caption(f"{SYSTEMS[system_of(params)].label} : classement à la fin de la dernière période complète "
+                       f"({cutoff:%d/%m/%Y}).")
+        st.dataframe(leaderboard_as_of(history_for_ui(games_df, params, league), cutoff), use_container_width=True)
+    else:
+        # bilans agrégés par la base (une ligne par joueur) ; seuls les classements viennent du rejeu
+        stats = load_player_stats(league, dataset_fingerprint(games_df))
+        st.dataframe(with_stats(ratings, stats), use_container_width=True)
+    render_rating_chart(games_df, params, ratings, league)
     with st.expander("Détails de calcul par partie"):
         st.dataframe(games_enriched, use_container_width=True)
+    render_league_overview(params)
+
+def render_league_overview(params: dict):
+    if not st.toggle("Comparer toutes les ligues", key="league_overview"):
+        return
+    # ligues indépendantes : seules celles modifiées depuis le dernier affichage sont rejouées (en parallèle)
+    frames = load_league_games(st.session_state.get("data_version", 0))
+    tables = league_tables(frames, params)
+    st.dataframe(league_summary(frames, tables), use_container_width=True, hide_index=True)
+
+def render_rating_chart(games_df: pd.DataFrame, params: dict, ratings: pd.DataFrame, league: str):
+    if ratings.empty:
+        return
+    st.subheader("Évolution des classements")
+    history = history_for_ui(games_df, params, league)
+    c1, c2 = st.columns([3, 2])
+    with c1:
+        players = st.multiselect("Joueurs", list(ratings["player"]), default=list(ratings["player"].head(3)), key="chart_players")
+    with c2:
+        dates = history.dates[~np.isnat(history.dates)]
+        period = st.date_input("Période", value=(pd.Timestamp(dates.min()).date(), pd.Timestamp(dates.max()).date()),
+                               key="chart_period") if len(dates) else ()
+    start, end = (tuple(period) + (None, None))[:2]
+    series = history.series_many(players, start, end)
+    if series.empty:
+        st.caption("Aucune partie sur la période.")
+        return
+    st.line_chart(series, x="date", y="rating", color="player")
 
 def render_tab_export(params: dict):
     if "data_version" not in st.session_state:
         st.session_state.data_version = 0
 
-    st.subheader("Exporter vers Excel (XLSX)")
+    st.subheader("Exporter (XLSX / CSV / Parquet / JSON)")
+    c1, c2 = st.columns(2)
+    with c1:
+        fmt = st.radio("Format", list(FORMATS), horizontal=True, key="export_fmt")
+    with c2:
+        sheet = st.radio("Table", list(SHEETS), format_func=SHEETS.get, horizontal=True,
+                         key="export_sheet", disabled=(fmt == "xlsx"))
+    if fmt == "xlsx":
+        sheet = ""  # classeur complet (Classement + Historique + TemplatePartie)
+
+    # artefact partagé entre sessions : même données + mêmes paramètres = même fichier
+    league = current_league()
+    games_df = load_games(st.session_state.data_version, league)
+    key = (dataset_fingerprint(games_df), system_key(params), fmt, sheet)
+
+    def prepare():
+        ratings, games_enriched = ratings_for_ui(games_df, params, league)
+        EXPORTS.request(key, fmt, sheet, ratings, games_enriched)
 
     if st.button("Préparer le fichier"):
-        games_df = load_games(st.session_state.data_version)
-        ratings, games_enriched = compute_ratings(games_df, params["start_rating"], params["base_k"],
-                                                            params["newbie_games"], params["newbie_k"])
-
-        buf = BytesIO()
-        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-            ratings.to_excel(writer, index=False, sheet_name="Classement")
-            games_enriched.to_excel(writer, index=False, sheet_name="Historique")
-            pd.DataFrame({"date":[datetime.today().date()], "white":["Alice"], "black":["Bob"], "result":[1.0]}).to_excel(
-                writer, index=False, sheet_name="TemplatePartie"
-            )
-        st.session_state["last_export"] = buf.getvalue()
-
-    if "last_export" in st.session_state:
-        st.download_button(
-            label="Télécharger le fichier Excel",
-            data=st.session_state["last_export"],
-            file_name="chessscore_export.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+        prepare()
+
+    _render_export_status(key, prepare)
+
+@st.fragment(run_every=1.0)
+def _poll_export(key):
+    """Suit la génération en tâche de fond sans relancer toute la page ; un seul rerun à la fin."""
+    artifact = EXPORTS.get(key)
+    if artifact is None or artifact.status != "pending":
+        st.rerun()
+    st.info("Génération du fichier en cours…")
+
+def _render_export_status(key, prepare):
+    artifact = EXPORTS.get(key)
+    if artifact is None:
+        return
+    if artifact.status == "pending":
+        _poll_export(key)
+    elif artifact.status == "error":
+        st.error(f"Export impossible : {artifact.error}")
+    else:
+        try:
+            with open(artifact.path, "rb") as f:
+                st.download_button(
+                    label=f"Télécharger {artifact.file_name}",
+                    data=f,
+                    file_name=artifact.file_name,
+                    mime=artifact.mime,
+                )
+        except FileNotFoundError:
+            # artefact évincé (exports d'autres sessions) entre get() et open() : régénéré
+            prepare()
+            _poll_export(key)
 
 
 def render_tab_params(params: dict):
-    st.subheader("Paramètres ELO")
+    st.subheader("Paramètres de classement")
     st.caption("Ces paramètres impactent tous les classements et exports.")
+    systems = list(SYSTEMS)
+    system_new = st.radio("Système", systems, index=systems.index(system_of(params)),
+                          format_func=lambda s: SYSTEMS[s].label, horizontal=True, key="params_system")
+    glicko = {k: params.get(k, v) for k, v in GLICKO_DEFAULTS.items()}
     c1, c2 = st.columns(2)
+    # paramètres de l'autre système : conservés tels quels
+    base_k_new, newbie_games_new, newbie_k_new = params["base_k"], params["newbie_games"], params["newbie_k"]
     with c1:
         start_rating_new = st.number_input("Élo initial", min_value=600, max_value=2400, value=int(params["start_rating"]), step=50)
-        base_k_new      = st.slider("K (joueurs établis)", min_value=8, max_value=64, value=int(params["base_k"]), step=1)
+        if system_new == "elo":
+            base_k_new  = st.slider("K (joueurs établis)", min_value=8, max_value=64, value=int(params["base_k"]), step=1)
+        else:
+            glicko["rd"] = st.number_input("RD initial", min_value=30, max_value=500, value=int(glicko["rd"]), step=10,
+                                           help="Incertitude d'un nouveau joueur ; elle croît aussi pendant l'inactivité.")
+            glicko["period"] = st.selectbox("Période de classement", list(PERIODS), index=list(PERIODS).index(glicko["period"]),
+                                            format_func=PERIODS.get, help="Les parties d'une même période sont évaluées ensemble.")
     with c2:
-        newbie_games_new= st.slider("Nb matchs 'nouveau'", min_value=0, max_value=30, value=int(params["newbie_games"]), step=1)
-        newbie_k_new    = st.slider("K (nouveau)", min_value=8, max_value=64, value=int(params["newbie_k"]), step=1)
+        if system_new == "elo":
+            newbie_games_new= st.slider("Nb matchs 'nouveau'", min_value=0, max_value=30, value=int(params["newbie_games"]), step=1)
+            newbie_k_new    = st.slider("K (nouveau)", min_value=8, max_value=64, value=int(params["newbie_k"]), step=1)
+        else:
+            glicko["volatility"] = st.number_input("Volatilité initiale (σ)", min_value=0.01, max_value=0.2,
+                                                   value=float(glicko["volatility"]), step=0.01, format="%.2f")
+            glicko["tau"] = st.number_input("τ (variation de la volatilité)", min_value=0.2, max_value=1.2,
+                                            value=float(glicko["tau"]), step=0.1, format="%.1f")
 
     if st.button("Enregistrer les paramètres"):
         st.session_state.elo_params = {
+            "system": system_new,
             "start_rating": int(start_rating_new),
             "base_k": int(base_k_new),
             "newbie_games": int(newbie_games_new),
             "newbie_k": int(newbie_k_new),
+            **glicko,
         }
         st.success("Paramètres mis à jour.")
         st.rerun()
 
+    # affichage : nombre de joueurs visibles d'office dans la sidebar
+    st.session_state.sidebar_top_n = int(st.number_input(
+        "Joueurs affichés dans la sidebar", min_value=1, max_value=200,
+        value=int(st.session_state.get("sidebar_top_n", TOP_N)), step=1,
+    ))
+
+    render_param_sweep(params)
+
+def _parse_int_list(raw: str) -> list[int]:
+    return sorted({int(x) for x in raw.replace(";", ",").split(",") if x.strip()})
+
+def render_param_sweep(params: dict):
+    with st.expander("Balayage de paramètres Élo (toutes les combinaisons en une passe)"):
+        st.caption("Valeurs séparées par des virgules. Score = log-loss de exp_white face aux résultats (plus bas = meilleur).")
+        c1, c2 = st.columns(2)
+        with c1:
+            sr = st.text_input("Élo initial", value=str(params["start_rating"]), key="sweep_start_rating")
+            bk = st.text_input("K (joueurs établis)", value="16, 20, 24, 32", key="sweep_base_k")
+        with c2:
+            ng = st.text_input("Nb matchs 'nouveau'", value="0, 5, 10, 20", key="sweep_newbie_games")
+            nk = st.text_input("K (nouveau)", value="32, 40, 48", key="sweep_newbie_k")
+
+        if st.button("Lancer le balayage"):
+            try:
+                grid = param_grid(_parse_int_list(sr), _parse_int_list(bk), _parse_int_list(ng), _parse_int_list(nk))
+            except ValueError:
+                st.warning("Valeurs invalides : entiers séparés par des virgules.")
+                return
+            games_df = load_games(st.session_state.get("data_version", 0), current_league())
+            with st.spinner(f"{len(grid)} combinaisons…"):
+                scores, tables = sweep_ratings(games_df, grid)
+            st.session_state["sweep"] = (scores, tables)
+
+        if "sweep" not in st.session_state:
+            return
+        scores, tables = st.session_state["sweep"]
+        ranked = scores.sort_values("log_loss").reset_index()
+        st.dataframe(ranked.drop(columns="index"), use_container_width=True)
+
+        labels = [" · ".join(f"{k}={row[k]}" for k in PARAM_NAMES) for _, row in ranked.iterrows()]
+        choice = st.selectbox("Classement pour la combinaison", range(len(labels)), format_func=lambda i: labels[i])
+        if choice is None:
+            return
+        st.dataframe(tables[int(ranked.loc[choice, "index"])], use_container_width=True)
+        if st.button("Appliquer ces paramètres"):
+            st.session_state.elo_params = {**params, "system": "elo", **{k: int(ranked.loc[choice, k]) for k in PARAM_NAMES}}
+            st.success("Paramètres mis à jour.")
+            st.rerun()
+
+def render_import():
+    st.subheader("Import de parties (CSV / PGN)")
+    st.caption("CSV : colonnes date, white, black, result (séparateur , ou ;). PGN : en-têtes Date, White, Black, Result. "
+               "Les parties vont dans la ligue courante ; une partie déjà présente (même date et mêmes joueurs) est mise à jour.")
+    uploaded = st.file_uploader("Fichier", type=["csv", "pgn"], key="import_file")
+    if uploaded is None or not st.button("Importer", type="primary"):
+        return
+    fmt = "pgn" if uploaded.name.lower().endswith(".pgn") else "csv"
+    league = current_league()
+    players = load_players(st.session_state.get("data_version", 0), league)
+    aliases = {} if players.empty else dict(players.dropna(subset=["alias"]).set_index("alias")["name"])
+    report = ImportReport()
+    try:
+        with perf.span("import.games") as sp:
+            f = io.TextIOWrapper(uploaded, encoding="utf-8-sig", errors="replace")
+            report.written = import_games(validated(read_batches(f, fmt), report, aliases), league)
+            sp.rows = report.read
+    except ValueError as e:
+        st.error(f"Import impossible : {e}")
+        return
+    # un seul recalcul pour tout l'import
+    st.session_state.data_version = st.session_state.get("data_version", 0) + 1
+    st.success(f"{report.written} partie(s) importée(s) sur {report.read} ligne(s) lue(s).")
+    rejected = report.rejected
+    if len(rejected):
+        st.warning(f"{len(rejected)} ligne(s) rejetée(s) :")
+        st.dataframe(rejected, use_container_width=True, hide_index=True)
+
 def render_tab_admin():
-    st.subheader("Gestion des joueurs (optionnel)")
-    df = load_players()
+    league = current_league()
+    st.subheader(f"Gestion des joueurs — ligue « {league} » (optionnel)")
+    df = load_players(st.session_state.get("data_version", 0), league)
     if df.empty:
         df = pd.DataFrame({"name":["Alice","Bob"], "alias":["A.","B."]})
     edit = st.data_editor(df, num_rows="dynamic", use_container_width=True, key="editor_players")
     if st.button("Sauvegarder la liste des joueurs"):
-        save_players_df(edit)
+        save_players_df(edit, league)
+        st.session_state.data_version = st.session_state.get("data_version", 0) + 1
         st.success("Joueurs sauvegardés.")
+
+    render_import()
+
+    st.subheader("Cache des classements")
+    stats = RATINGS.stats()
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Hits", stats["hits"])
+    m2.metric("Misses", stats["misses"])
+    m3.metric("Taux de hit", f"{stats['hit_rate']:.0%}")
+    m4.metric("Entrées", f"{stats['size']}/{stats['maxsize']}")
+    st.caption(f"Évictions : {stats['evictions']}")
+
+    st.subheader("Performances")
+    st.caption("Durées par span (ms) : p50 / p95 sur les derniers appels, et détail des reruns récents.")
+    st.dataframe(perf.span_summary(), use_container_width=True, hide_index=True)
+    st.dataframe(perf.recent_reruns(), use_container_width=True, hide_index=True)
+
+    st.subheader("Données")
+    st.caption("L'historique est gardé en mémoire et rafraîchi par différentiel ; forcer un rechargement complet si la base a été modifiée hors de l'application.")
+    if st.button("Recharger l'historique depuis la base"):
+        invalidate_games()
+        st.session_state.data_version = st.session_state.get("data_version", 0) + 1
+        st.success("Historique rechargé au prochain affichage.")